@@ -1,77 +1,131 @@
+from time import perf_counter
+
+_import_started = perf_counter()
+
+import logging
+import os
+import weakref
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from sqlalchemy.orm import DeclarativeBase
-from os import environ
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
-from sqlalchemy_utils import database_exists, create_database
 from dotenv import load_dotenv
+from app.utils.json_provider import FastJSONProvider
+from app.utils.replicas import RoutingSession, init_replica_routing
 
 load_dotenv(override=True)
 
+logger = logging.getLogger(__name__)
+
 
 class Base(DeclarativeBase):
     pass
 
 
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={"class_": RoutingSession})
 bcrypt = Bcrypt()
 jwt = JWTManager()
 migrate = Migrate()
 
+_IMPORT_SECONDS = perf_counter() - _import_started
+_apps = weakref.WeakSet()
+
+
+def _dispose_engines_after_fork() -> None:
+    # Pooled connections opened before the fork (gunicorn --preload) belong
+    # to the parent; drop them without closing the parent's sockets
+    for app in list(_apps):
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_engines_after_fork)
+
+
+def bootstrap_database(app) -> None:
+    """Create the database and its tables if they do not exist yet."""
+    from sqlalchemy_utils import database_exists, create_database
+
+    url = app.config['SQLALCHEMY_DATABASE_URI']
+    if not database_exists(url):
+        create_database(url)
+        logger.info("Database created at %s", url)
+
+    with app.app_context():
+        db.create_all()
+
 
 def create_app(config=None):
-    app = Flask(__name__)
+    timings = {"imports": _IMPORT_SECONDS}
+    started = perf_counter()
 
-    url = environ.get("POSTGRESQL_URL")
-    if not url:
-        raise ValueError("POSTGRESQL_URL environment variable is not set")
+    def lap(phase):
+        nonlocal started
+        now = perf_counter()
+        timings[phase] = now - started
+        started = now
 
-    try:
-        if not database_exists(url):
-            create_database(url)
-            print(f"Database created successfully at {url}")
-        else:
-            print("Database already exists")
-    except Exception as e:
-        print(f"Error connecting to database: {str(e)}")
-        raise
-
-    app.config.update(
-        SQLALCHEMY_DATABASE_URI=url,
-        SQLALCHEMY_TRACK_MODIFICATIONS=False,
-        JWT_SECRET_KEY=environ.get("SECRET_KEY"),
-        SECRET_KEY=environ.get("SECRET_KEY"),
-    )
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
+    from app.config import Config, engine_options
+    app.config.from_object(Config)
     if config:
         app.config.update(config)
 
+    if not app.config['SQLALCHEMY_DATABASE_URI']:
+        raise ValueError("POSTGRESQL_URL environment variable is not set")
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    # app.logger is the "app" logger every module logs under; setting its
+    # level also makes Flask attach a stderr handler unless one is configured
+    app.logger.setLevel(app.config['LOG_LEVEL'])
+    lap("config")
+
     db.init_app(app)
     bcrypt.init_app(app)
     jwt.init_app(app)
     migrate.init_app(app, db)
+    init_replica_routing(app)
+
+    from app.services.password_hasher import init_password_hasher
+    from app.utils.user_cache import init_user_cache
+    from app.utils.revocation import init_revocation
+    init_password_hasher(app)
+    init_user_cache(jwt)
+    init_revocation(jwt)
+    lap("extensions")
 
     # Register blueprints
     from app.routes.auth import auth_bp
     from app.routes.users import users_bp
     from app.routes.accounts import accounts_bp
     from app.routes.transactions import transactions_bp
+    from app.routes.health import health_bp
     from app.swagger import swagger_ui_blueprint
 
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(users_bp, url_prefix='/api/users')
     app.register_blueprint(accounts_bp, url_prefix='/api/accounts')
     app.register_blueprint(transactions_bp, url_prefix='/api/transactions')
+    app.register_blueprint(health_bp, url_prefix='/api/health')
     app.register_blueprint(swagger_ui_blueprint)
+    lap("blueprints")
 
-    with app.app_context():
-        try:
-            db.create_all()
-            print("Database tables created successfully")
-        except Exception as e:
-            print(f"Error creating tables: {str(e)}")
-            raise
+    # Register CLI commands
+    from app.commands import register_commands
+    register_commands(app)
+    lap("commands")
+
+    if app.config['DB_BOOTSTRAP']:
+        bootstrap_database(app)
+        lap("database_bootstrap")
+
+    app.extensions['startup_timings'] = timings
+    logger.info("Startup timings: %s", ", ".join(
+        f"{phase}={seconds * 1000:.1f}ms" for phase, seconds in timings.items()))
 
+    _apps.add(app)
     return app
@@ -0,0 +1,281 @@
+import threading
+from datetime import timedelta
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+snapshots_cli = AppGroup('snapshots', help='Daily account balance snapshots.')
+
+
+@snapshots_cli.command('build')
+@click.option('--through', type=click.DateTime(formats=['%Y-%m-%d']),
+              default=None, help='Last day to snapshot (default: yesterday, UTC).')
+def build_snapshots_command(through):
+    """Snapshot closing balances for every day not yet covered."""
+    from app.services.balance_snapshots import build_snapshots
+
+    written = build_snapshots(through.date() if through else None)
+    for day, count in written.items():
+        click.echo(f"{day.isoformat()}: {count} snapshot(s)")
+    click.echo(f"Processed {len(written)} day(s)")
+
+
+rollups_cli = AppGroup('rollups', help='Monthly transaction rollups.')
+
+
+@rollups_cli.command('rebuild')
+def rebuild_rollups_command():
+    """Recompute all rollups from transaction history."""
+    from app.services.rollups import rebuild_rollups
+
+    count = rebuild_rollups()
+    click.echo(f"Wrote {count} rollup row(s)")
+
+
+partitions_cli = AppGroup(
+    'partitions', help='Monthly partitions of the transactions table.')
+
+
+@partitions_cli.command('init')
+@click.option('--months-ahead', default=3, show_default=True,
+              help='Monthly partitions to create after the current month.')
+def init_partitions_command(months_ahead):
+    """Convert the transactions table to a partitioned table."""
+    from app.services.partitions import convert_to_partitioned, is_partitioned
+
+    if is_partitioned():
+        click.echo("transactions is already partitioned")
+        return
+    boundary = convert_to_partitioned(months_ahead)
+    click.echo(f"Existing rows kept in transactions_legacy (before {boundary.isoformat()})")
+
+
+@partitions_cli.command('create')
+@click.option('--months-ahead', default=3, show_default=True,
+              help='Monthly partitions to keep ready after the current month.')
+def create_partitions_command(months_ahead):
+    """Create upcoming monthly partitions."""
+    from app.services.partitions import create_partitions
+
+    for name in create_partitions(months_ahead):
+        click.echo(f"Created {name}")
+
+
+@partitions_cli.command('detach')
+@click.option('--keep-months', type=int, required=True,
+              help='Months of history to keep attached, besides the current one.')
+@click.option('--archive-schema', default=None,
+              help='Move detached partitions into this schema.')
+@click.option('--drop', is_flag=True, help='Drop detached partitions.')
+def detach_partitions_command(keep_months, archive_schema, drop):
+    """Detach (and archive or drop) partitions past the retention window."""
+    from app.services.partitions import detach_partitions
+
+    if drop and archive_schema:
+        raise click.UsageError("--drop and --archive-schema are exclusive")
+    for name in detach_partitions(keep_months, archive_schema, drop):
+        click.echo(f"Detached {name}")
+
+
+transfers_cli = AppGroup('transfers', help='Asynchronous transfer processing.')
+
+
+@transfers_cli.command('work')
+@click.option('--workers', default=4, show_default=True,
+              help='Worker threads draining the intent queue.')
+@click.option('--batch-size', default=100, show_default=True,
+              help='Intents applied per DB transaction.')
+@click.option('--poll-interval', default=0.5, show_default=True,
+              help='Seconds to wait when the queue is empty.')
+@click.option('--once', is_flag=True, help='Process a single batch and exit.')
+def work_transfers_command(workers, batch_size, poll_interval, once):
+    """Apply pending transfer intents."""
+    from app.services.transfer_worker import process_batch, run_workers
+
+    if once:
+        click.echo(f"Processed {process_batch(batch_size)} intent(s)")
+        return
+
+    stop = threading.Event()
+    click.echo(f"Starting {workers} transfer worker(s)")
+    try:
+        run_workers(current_app._get_current_object(),
+                    workers, batch_size, poll_interval, stop)
+    except KeyboardInterrupt:
+        stop.set()
+
+
+hot_accounts_cli = AppGroup(
+    'hot-accounts', help='Balance slots for accounts receiving heavy traffic.')
+
+
+@hot_accounts_cli.command('enable')
+@click.argument('account_id', type=int)
+@click.option('--slots', default=16, show_default=True,
+              type=click.IntRange(1, 256), help='Number of balance slots.')
+def enable_hot_account_command(account_id, slots):
+    """Spread credits to an account over balance slots."""
+    from app.services.hot_accounts import enable
+
+    if not enable(account_id, slots):
+        raise click.ClickException(f"Account {account_id} not found")
+    click.echo(f"Account {account_id} uses {slots} balance slot(s)")
+
+
+@hot_accounts_cli.command('disable')
+@click.argument('account_id', type=int)
+def disable_hot_account_command(account_id):
+    """Fold the slots of an account and turn hot mode off."""
+    from app.services.hot_accounts import disable
+
+    if not disable(account_id):
+        raise click.ClickException(f"Account {account_id} not found")
+    click.echo(f"Account {account_id} is a regular account again")
+
+
+@hot_accounts_cli.command('fold')
+def fold_hot_accounts_command():
+    """Move slot balances into the base balance of every hot account."""
+    from app.services.hot_accounts import fold_all
+
+    folded = fold_all()
+    for account_id, amount in folded.items():
+        click.echo(f"Account {account_id}: folded {amount}")
+    click.echo(f"Folded {len(folded)} account(s)")
+
+
+ledger_cli = AppGroup('ledger', help='Double-entry postings.')
+
+
+@ledger_cli.command('reconcile')
+@click.option('--workers', default=4, show_default=True,
+              help='Worker processes checking account ranges.')
+@click.option('--chunk-size', default=10000, show_default=True,
+              help='Accounts per range.')
+def reconcile_command(workers, chunk_size):
+    """Compare every account balance with the sum of its postings."""
+    from app.services.reconciliation import reconcile
+
+    count, drifts = reconcile(workers, chunk_size)
+    for drift in drifts:
+        click.echo(f"Account {drift.account_id}: balance {drift.balance}, "
+                   f"postings {drift.posted}, drift {drift.difference}")
+    click.echo(f"Checked {count} account(s), {len(drifts)} with drift")
+    if drifts:
+        raise SystemExit(1)
+
+
+@ledger_cli.command('backfill')
+@click.option('--chunk-size', default=50000, show_default=True,
+              help='Transactions per DB transaction.')
+def backfill_postings_command(chunk_size):
+    """Write postings for transactions that have none."""
+    from app.services.reconciliation import backfill_postings
+
+    click.echo(f"Wrote {backfill_postings(chunk_size)} posting(s)")
+
+
+accounts_cli = AppGroup('accounts', help='Account maintenance.')
+
+
+@accounts_cli.command('purge')
+@click.option('--grace-days', default=30, show_default=True,
+              help='Only purge accounts deleted at least this many days ago.')
+@click.option('--chunk-size', default=1000, show_default=True,
+              help='Rows deleted per DB transaction.')
+def purge_accounts_command(grace_days, chunk_size):
+    """Remove the history of soft-deleted accounts."""
+    from app.services.account_purge import purge_deleted_accounts
+
+    purged = purge_deleted_accounts(timedelta(days=grace_days), chunk_size)
+    for account_id, count in purged.items():
+        click.echo(f"Account {account_id}: removed {count} transaction(s)")
+    click.echo(f"Purged {len(purged)} account(s)")
+
+
+tokens_cli = AppGroup('tokens', help='JWT revocation list.')
+
+
+@tokens_cli.command('prune')
+def prune_tokens_command():
+    """Delete revocations of tokens that have expired."""
+    from app.utils.revocation import prune_expired
+
+    click.echo(f"Pruned {prune_expired()} revoked token(s)")
+
+
+idempotency_cli = AppGroup('idempotency', help='Stored Idempotency-Key responses.')
+
+
+@idempotency_cli.command('purge')
+@click.option('--retention-hours', type=float, default=None,
+              help='Keep keys this recent (default: IDEMPOTENCY_KEY_RETENTION_HOURS).')
+@click.option('--chunk-size', default=1000, show_default=True,
+              help='Rows deleted per DB transaction.')
+def purge_idempotency_keys_command(retention_hours, chunk_size):
+    """Delete stored responses of idempotency keys past their retention."""
+    from app.utils.idempotency import purge_expired
+
+    if retention_hours is None:
+        retention_hours = current_app.config.get('IDEMPOTENCY_KEY_RETENTION_HOURS', 24)
+    purged = purge_expired(timedelta(hours=retention_hours), chunk_size)
+    click.echo(f"Purged {purged} idempotency key(s)")
+
+
+users_cli = AppGroup('users', help='User administration.')
+
+
+@users_cli.command('import')
+@click.argument('source', type=click.File('r', encoding='utf-8'))
+@click.option('--batch-size', default=5000, show_default=True,
+              help='Users inserted per statement.')
+@click.option('--workers', type=int, default=None,
+              help='Hashing processes (default: CPU count).')
+def import_users_command(source, batch_size, workers):
+    """Import users from a CSV file.
+
+    Columns: username, email and either password or password_hash.
+    Users whose username or email already exists are skipped.
+    """
+    from app.services.user_import import import_users
+
+    result = import_users(source, batch_size, workers)
+    click.echo(f"Read {result.read} row(s): {result.inserted} imported, "
+               f"{result.skipped} already existing, {result.invalid} invalid")
+
+
+schema_cli = AppGroup('schema', help='Database provisioning.')
+
+
+@schema_cli.command('create')
+def create_schema_command():
+    """Create the database and any missing tables."""
+    from app import bootstrap_database
+
+    bootstrap_database(current_app._get_current_object())
+    click.echo("Created missing tables; existing tables are not altered, "
+               "use migrations for that")
+
+
+@click.command('startup-timings')
+def startup_timings_command():
+    """Show how long each phase of create_app took."""
+    timings = current_app.extensions['startup_timings']
+    for phase, seconds in timings.items():
+        click.echo(f"{phase:<20} {seconds * 1000:8.1f} ms")
+    click.echo(f"{'total':<20} {sum(timings.values()) * 1000:8.1f} ms")
+
+
+def register_commands(app):
+    app.cli.add_command(snapshots_cli)
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(partitions_cli)
+    app.cli.add_command(transfers_cli)
+    app.cli.add_command(hot_accounts_cli)
+    app.cli.add_command(ledger_cli)
+    app.cli.add_command(accounts_cli)
+    app.cli.add_command(tokens_cli)
+    app.cli.add_command(idempotency_cli)
+    app.cli.add_command(users_cli)
+    app.cli.add_command(schema_cli)
+    app.cli.add_command(startup_timings_command)
@@ -1,12 +1,80 @@
 import os
 from datetime import timedelta
+from sqlalchemy.engine import make_url
+from app.utils.pool_metrics import InstrumentedQueuePool
+from app.utils.replicas import replica_bind_keys
+
+
+def _flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() not in ('0', 'false', 'no', '')
+
+
+def engine_options(config) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS derived from the DB_* settings."""
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    options = {"pool_pre_ping": config['DB_POOL_PRE_PING']}
+    # In-memory sqlite keeps Flask-SQLAlchemy's single static connection
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=config['DB_POOL_SIZE'],
+        max_overflow=config['DB_MAX_OVERFLOW'],
+        pool_timeout=config['DB_POOL_TIMEOUT'],
+        pool_recycle=config['DB_POOL_RECYCLE'],
+    )
+    if url.get_backend_name() == 'postgresql' and config['DB_STATEMENT_TIMEOUT_MS']:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"
+        }
+    return options
 
 
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY')
-    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///banking.db')
+    SQLALCHEMY_DATABASE_URI = os.getenv('POSTGRESQL_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Level of the app.* loggers, e.g. startup timings and maintenance warnings
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    # Optional comma-separated read replica URLs
+    SQLALCHEMY_BINDS = replica_bind_keys(
+        url.strip()
+        for url in os.getenv('POSTGRESQL_REPLICA_URLS', '').split(',')
+        if url.strip()
+    )
+    # Connections per worker process: pool_size + max_overflow, per engine
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = _flag('DB_POOL_PRE_PING', '1')
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))
+    # /api/health/pool is disabled unless set; scrapers send it as X-Metrics-Token
+    POOL_STATS_TOKEN = os.getenv('POOL_STATS_TOKEN')
+    # Production workers leave provisioning to `flask schema create`
+    # or migrations instead of each running it at boot
+    DB_BOOTSTRAP = _flag('DB_BOOTSTRAP', '1')
     JWT_SECRET_KEY = os.getenv(
         'SECRET_KEY')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    IDEMPOTENCY_CACHE_SIZE = int(os.getenv('IDEMPOTENCY_CACHE_SIZE', 1024))
+    IDEMPOTENCY_KEY_RETENTION_HOURS = float(os.getenv('IDEMPOTENCY_KEY_RETENTION_HOURS', 24))
+    ACCOUNT_NUMBER_BLOCK_SIZE = int(os.getenv('ACCOUNT_NUMBER_BLOCK_SIZE', 100))
+    READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', 5))
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', 2))
+    REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('REPLICA_LAG_CHECK_INTERVAL', 1))
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    # Hashing processes per web worker; every gunicorn worker starts its own
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 16))
+    LOGIN_THROTTLE_STORE = os.getenv('LOGIN_THROTTLE_STORE', 'memory')
+    LOGIN_THROTTLE_WINDOW = float(os.getenv('LOGIN_THROTTLE_WINDOW', 60))
+    LOGIN_USER_LIMIT = int(os.getenv('LOGIN_USER_LIMIT', 5))
+    LOGIN_IP_LIMIT = int(os.getenv('LOGIN_IP_LIMIT', 20))
+    LOGIN_THROTTLE_CACHE_SIZE = int(os.getenv('LOGIN_THROTTLE_CACHE_SIZE', 100000))
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 10000))
+    USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', 60))
+    TOKEN_REVOCATION_SYNC_INTERVAL = float(os.getenv('TOKEN_REVOCATION_SYNC_INTERVAL', 5))
+    TOKEN_REVOCATION_RELOAD_INTERVAL = float(os.getenv('TOKEN_REVOCATION_RELOAD_INTERVAL', 300))
@@ -1,11 +1,32 @@
 from .user import User
 from .account import Account, AccountType
+from .account_balance_slot import AccountBalanceSlot
+from .account_number_counter import AccountNumberCounter
 from .transaction import Transaction, TransactionType
+from .idempotency_key import IdempotencyKey
+from .balance_snapshot import AccountBalanceSnapshot
+from .transaction_rollup import TransactionRollup, RollupCategory
+from .transfer_intent import TransferIntent, TransferIntentStatus
+from .posting import Posting, PostingDirection
+from .login_throttle import LoginThrottle
+from .revoked_token import RevokedToken
 
 __all__ = [
     "User",
     "Account",
     "AccountType",
+    "AccountBalanceSlot",
+    "AccountNumberCounter",
     "Transaction",
     "TransactionType",
+    "IdempotencyKey",
+    "AccountBalanceSnapshot",
+    "TransactionRollup",
+    "RollupCategory",
+    "TransferIntent",
+    "TransferIntentStatus",
+    "Posting",
+    "PostingDirection",
+    "LoginThrottle",
+    "RevokedToken",
 ]
@@ -3,8 +3,9 @@ from decimal import Decimal
 from enum import Enum
 from typing import Optional
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, Enum as SQLEnum, Numeric
+from sqlalchemy import ForeignKey, Enum as SQLEnum, Numeric, func, select
 from app import db
+from .account_balance_slot import AccountBalanceSlot
 
 
 class AccountType(str, Enum):
@@ -27,6 +28,10 @@ class Account(db.Model):
     balance: Mapped[Decimal] = mapped_column(
         Numeric(10, 2), nullable=False, default=0.00
     )
+    # Number of AccountBalanceSlot rows absorbing credits; 0 = regular account
+    balance_slots: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default='0'
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         db.DateTime(timezone=True),
@@ -40,29 +45,60 @@ class Account(db.Model):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+    # Soft deletion: hidden everywhere once set; history is purged later
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(
+        db.DateTime(timezone=True), nullable=True
+    )
+    purged_at: Mapped[Optional[datetime]] = mapped_column(
+        db.DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     user = relationship("User", back_populates="accounts")
     transactions_sent = relationship(
         "Transaction",
         foreign_keys="Transaction.from_account_id",
-        back_populates="from_account",
-        cascade="all, delete-orphan"
+        back_populates="from_account"
     )
     transactions_received = relationship(
         "Transaction",
         foreign_keys="Transaction.to_account_id",
-        back_populates="to_account",
-        cascade="all, delete-orphan"
+        back_populates="to_account"
     )
 
+    def total_balance(self) -> Decimal:
+        """Base balance plus any credits still parked in balance slots."""
+        if not self.balance_slots:
+            return self.balance
+        # Set by ledger.load_slot_totals for accounts serialized in bulk
+        slot_total = self.__dict__.get('_slot_total')
+        if slot_total is None:
+            slot_total = db.session.scalar(
+                select(func.coalesce(func.sum(AccountBalanceSlot.balance), 0))
+                .where(AccountBalanceSlot.account_id == self.id)
+            )
+        return self.balance + slot_total
+
     def to_dict(self) -> dict:
         return {
             'id': self.id,
             'user_id': self.user_id,
             'account_type': self.account_type.value,
             'account_number': self.account_number,
-            'balance': str(self.balance),
+            'balance': str(self.total_balance()),
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
+
+    def __json__(self) -> dict:
+        # Same output as to_dict(); the JSON encoder writes the enum and
+        # the datetimes itself, orjson without calling back into Python
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'account_type': self.account_type,
+            'account_number': self.account_number,
+            'balance': str(self.total_balance()),
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
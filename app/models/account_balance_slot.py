@@ -0,0 +1,25 @@
+from decimal import Decimal
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, Numeric, UniqueConstraint
+from app import db
+
+
+class AccountBalanceSlot(db.Model):
+    """One of the sub-balances that absorb credits to a hot account.
+
+    Credits pick a slot at random so concurrent writers rarely contend on
+    the same row; a periodic job folds the slots back into Account.balance.
+    """
+    __tablename__ = 'account_balance_slots'
+    __table_args__ = (
+        UniqueConstraint('account_id', 'slot',
+                         name='uq_account_balance_slots_account_slot'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    account_id: Mapped[int] = mapped_column(
+        ForeignKey('accounts.id'), nullable=False)
+    slot: Mapped[int] = mapped_column(nullable=False)
+    balance: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), nullable=False, default=0
+    )
@@ -0,0 +1,11 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger
+from app import db
+
+
+class AccountNumberCounter(db.Model):
+    """Single-row high-water mark of reserved account number blocks."""
+    __tablename__ = 'account_number_counters'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    next_value: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -0,0 +1,32 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, Numeric, UniqueConstraint
+from app import db
+
+
+class AccountBalanceSnapshot(db.Model):
+    """Closing balance of an account at the end of a UTC day.
+
+    Snapshots are sparse: a row only exists for days on which the account
+    had activity, and the latest earlier row carries over otherwise.
+    """
+    __tablename__ = 'account_balance_snapshots'
+    __table_args__ = (
+        UniqueConstraint('account_id', 'snapshot_date',
+                         name='uq_account_balance_snapshots_account_date'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    account_id: Mapped[int] = mapped_column(
+        ForeignKey('accounts.id'), nullable=False)
+    snapshot_date: Mapped[date] = mapped_column(db.Date, nullable=False)
+    balance: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), nullable=False
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
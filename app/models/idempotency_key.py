@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, UniqueConstraint
+from app import db
+
+
+class IdempotencyKey(db.Model):
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (
+        UniqueConstraint('user_id', 'key',
+                         name='uq_idempotency_keys_user_id_key'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id'), nullable=False)
+    key: Mapped[str] = mapped_column(db.String(255), nullable=False)
+    request_hash: Mapped[str] = mapped_column(db.String(64), nullable=False)
+    status_code: Mapped[int] = mapped_column(nullable=False)
+    response_body: Mapped[str] = mapped_column(db.Text, nullable=False)
+    # Replayed with the body, e.g. the status URL of an async transfer
+    response_location: Mapped[Optional[str]] = mapped_column(
+        db.String(2048), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        index=True,
+        default=lambda: datetime.now(timezone.utc),
+    )
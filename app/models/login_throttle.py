@@ -0,0 +1,12 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from app import db
+
+
+class LoginThrottle(db.Model):
+    """Token bucket shared by all workers, keyed by username or client IP."""
+    __tablename__ = 'login_throttles'
+
+    key: Mapped[str] = mapped_column(db.String(255), primary_key=True)
+    tokens: Mapped[float] = mapped_column(db.Float, nullable=False)
+    # Seconds since the epoch; plain numbers keep the refill math portable
+    updated_at: Mapped[float] = mapped_column(db.Float, nullable=False)
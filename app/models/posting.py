@@ -0,0 +1,61 @@
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DDL, ForeignKey, Enum as SQLEnum, Index, Numeric, event
+from app import db
+
+
+class PostingDirection(str, Enum):
+    DEBIT = "debit"
+    CREDIT = "credit"
+
+
+class Posting(db.Model):
+    """One side of a double-entry transaction; rows are never changed.
+
+    A credit raises the account balance and a debit lowers it. Deposits and
+    withdrawals post their other side with account_id NULL (cash outside the
+    bank). transaction_id has no foreign key because transactions may be
+    partitioned.
+    """
+    __tablename__ = 'postings'
+    __table_args__ = (
+        Index('ix_postings_account_id', 'account_id'),
+        Index('ix_postings_transaction_id', 'transaction_id'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    transaction_id: Mapped[int] = mapped_column(nullable=False)
+    account_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey('accounts.id'), nullable=True
+    )
+    direction: Mapped[PostingDirection] = mapped_column(
+        SQLEnum(PostingDirection), nullable=False
+    )
+    amount: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True), nullable=False
+    )
+
+
+# Enforce append-only at the database level on PostgreSQL; only the purge
+# of deleted accounts may delete, after SET LOCAL ledger.purge = 'on'
+event.listen(
+    Posting.__table__,
+    'after_create',
+    DDL(
+        "CREATE OR REPLACE FUNCTION postings_immutable() RETURNS trigger AS $$ "
+        "BEGIN "
+        "IF TG_OP = 'DELETE' AND current_setting('ledger.purge', true) = 'on' "
+        "THEN RETURN OLD; END IF; "
+        "RAISE EXCEPTION 'postings are append-only'; "
+        "END; "
+        "$$ LANGUAGE plpgsql; "
+        "CREATE TRIGGER postings_immutable BEFORE UPDATE OR DELETE ON postings "
+        "FOR EACH ROW EXECUTE FUNCTION postings_immutable()"
+    ).execute_if(dialect='postgresql')
+)
@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey
+from app import db
+
+
+class RevokedToken(db.Model):
+    __tablename__ = 'revoked_tokens'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    jti: Mapped[str] = mapped_column(db.String(36), unique=True, nullable=False)
+    token_type: Mapped[str] = mapped_column(db.String(10), nullable=False)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id'), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True), nullable=False)
+    # Each process fetches the revocations added since its last sync by this
+    revoked_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        index=True,
+        default=lambda: datetime.now(timezone.utc),
+    )
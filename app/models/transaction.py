@@ -3,7 +3,7 @@ from decimal import Decimal
 from enum import Enum
 from typing import Optional
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, Enum as SQLEnum, Numeric
+from sqlalchemy import ForeignKey, Enum as SQLEnum, Index, Numeric
 from app import db
 
 
@@ -15,6 +15,14 @@ class TransactionType(str, Enum):
 
 class Transaction(db.Model):
     __tablename__ = 'transactions'
+    __table_args__ = (
+        # Serve "latest N for an account" listings and keyset pages straight
+        # from the index, in (created_at, id) order
+        Index('ix_transactions_from_account_id_created_at',
+              'from_account_id', 'created_at', 'id'),
+        Index('ix_transactions_to_account_id_created_at',
+              'to_account_id', 'created_at', 'id'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     from_account_id: Mapped[Optional[int]] = mapped_column(
@@ -60,3 +68,16 @@ class Transaction(db.Model):
             'description': self.description,
             'created_at': self.created_at.isoformat()
         }
+
+    def __json__(self) -> dict:
+        # Same output as to_dict(); the JSON encoder writes the enum and
+        # the datetime itself, orjson without calling back into Python
+        return {
+            'id': self.id,
+            'from_account_id': self.from_account_id,
+            'to_account_id': self.to_account_id,
+            'amount': str(self.amount),
+            'type': self.type,
+            'description': self.description,
+            'created_at': self.created_at
+        }
@@ -0,0 +1,43 @@
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, Enum as SQLEnum, Numeric, UniqueConstraint
+from app import db
+
+
+class RollupCategory(str, Enum):
+    DEPOSIT = "deposit"
+    WITHDRAWAL = "withdrawal"
+    TRANSFER_IN = "transfer_in"
+    TRANSFER_OUT = "transfer_out"
+
+
+class TransactionRollup(db.Model):
+    """Per-account monthly count and total for one transaction category."""
+    __tablename__ = 'transaction_rollups'
+    __table_args__ = (
+        UniqueConstraint('account_id', 'month', 'category',
+                         name='uq_transaction_rollups_account_month_category'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    account_id: Mapped[int] = mapped_column(
+        ForeignKey('accounts.id'), nullable=False)
+    month: Mapped[date] = mapped_column(db.Date, nullable=False)
+    category: Mapped[RollupCategory] = mapped_column(
+        SQLEnum(RollupCategory), nullable=False
+    )
+    count: Mapped[int] = mapped_column(nullable=False, default=0)
+    total: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            'account_id': self.account_id,
+            'month': self.month.strftime('%Y-%m'),
+            'type': self.category.value,
+            'count': self.count,
+            'total': str(self.total)
+        }
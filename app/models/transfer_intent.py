@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, Enum as SQLEnum, Index, Numeric
+from app import db
+
+
+class TransferIntentStatus(str, Enum):
+    PENDING = "pending"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class TransferIntent(db.Model):
+    """A transfer accepted for asynchronous processing by the worker pool."""
+    __tablename__ = 'transfer_intents'
+    __table_args__ = (
+        Index('ix_transfer_intents_status_id', 'status', 'id'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id'), nullable=False)
+    from_account_id: Mapped[int] = mapped_column(
+        ForeignKey('accounts.id'), nullable=False)
+    # Not foreign keys: the receiver is only checked when the intent is
+    # applied, and transactions may be partitioned with a composite key
+    to_account_id: Mapped[int] = mapped_column(nullable=False)
+    transaction_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    amount: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), nullable=False
+    )
+    description: Mapped[Optional[str]] = mapped_column(
+        db.String(255), nullable=True
+    )
+    status: Mapped[TransferIntentStatus] = mapped_column(
+        SQLEnum(TransferIntentStatus),
+        nullable=False,
+        default=TransferIntentStatus.PENDING
+    )
+    error: Mapped[Optional[str]] = mapped_column(
+        db.String(255), nullable=True
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'from_account_id': self.from_account_id,
+            'to_account_id': self.to_account_id,
+            'amount': str(self.amount),
+            'description': self.description,
+            'status': self.status.value,
+            'error': self.error,
+            'transaction_id': self.transaction_id,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
@@ -1,7 +1,8 @@
 from datetime import datetime, timezone
 from typing import Optional, List, TYPE_CHECKING
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app import db, bcrypt
+from app import db
+from app.services.password_hasher import hasher
 
 if TYPE_CHECKING:
     from .account import Account
@@ -36,11 +37,14 @@ class User(db.Model):
     )
 
     def set_password(self, password: str) -> None:
-        self.password_hash = bcrypt.generate_password_hash(
-            password).decode('utf-8')
+        self.password_hash = hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return hasher.check(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        """True if the hash was made with a different bcrypt cost."""
+        return hasher.needs_rehash(self.password_hash)
 
     def to_dict(self) -> dict:
         return {
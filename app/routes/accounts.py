@@ -1,43 +1,80 @@
-import random
-import string
+from datetime import datetime, timezone
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import func, select, update
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from app.models.user import User
 from app.models.account import Account, AccountType
-from app.schemas.account_schema import AccountCreateSchema, AccountUpdateSchema
+from app.models.account_balance_slot import AccountBalanceSlot
+from app.schemas.account_schema import AccountCreateSchema, AccountUpdateSchema, AccountQuerySchema
+from app.services import ledger
+from app.services.account_numbers import next_account_number
+from app.services.balance_snapshots import balance_as_of
+from app.utils.conditional import REVALIDATE, cacheable, make_etag, not_modified
 from app.utils.response import api_response
+from app.utils.replicas import replica_reads
 from app import db
 
 accounts_bp = Blueprint('accounts', __name__)
 
 
-def generate_account_number() -> str:
-    """Generate a random 12-digit account number."""
-    return ''.join(random.choices(string.digits, k=12))
+def account_versions(user_id, account_id=None) -> list:
+    """Version parts of the user's accounts, without loading the rows.
+
+    Credits to hot accounts only touch their balance slots, so the slot
+    total is part of the version next to updated_at.
+    """
+    parked = (
+        select(func.coalesce(func.sum(AccountBalanceSlot.balance), 0))
+        .where(AccountBalanceSlot.account_id == Account.id)
+        .scalar_subquery()
+    )
+    stmt = select(Account.id, Account.updated_at, parked).where(
+        Account.user_id == user_id, Account.deleted_at.is_(None))
+    if account_id is not None:
+        stmt = stmt.where(Account.id == account_id)
+    return [
+        f"{row_id}:{updated_at.isoformat()}:{slots}"
+        for row_id, updated_at, slots in db.session.execute(stmt.order_by(Account.id))
+    ]
 
 
 @accounts_bp.route('', methods=['GET'])
+@replica_reads
 @jwt_required()
 def get_user_accounts():
     current_user_id = get_jwt_identity()
-    accounts = Account.query.filter_by(user_id=current_user_id).all()
+    etag = make_etag('accounts', *account_versions(current_user_id))
+    cached = not_modified(etag, REVALIDATE)
+    if cached:
+        return cached
 
-    return api_response(
+    accounts = Account.query.filter_by(
+        user_id=current_user_id, deleted_at=None).all()
+    ledger.load_slot_totals(accounts)
+
+    return cacheable(api_response(
         "Accounts retrieved successfully",
         200,
-        data=[account.to_dict() for account in accounts] if accounts else []
-    )
+        data=accounts
+    ), etag, REVALIDATE)
 
 
 @accounts_bp.route('/<int:account_id>', methods=['GET'])
+@replica_reads
 @jwt_required()
 def get_account_by_id(account_id: int):
     current_user_id = get_jwt_identity()
-    account = Account.query.filter_by(
-        id=account_id, user_id=current_user_id).first()
+    query_data = AccountQuerySchema.validate(request.args)
 
-    if not account:
+    if not query_data:
+        return api_response(
+            "Invalid input data",
+            400,
+            errors={"message": "as_of must be an ISO 8601 date-time"}
+        )
+
+    versions = account_versions(current_user_id, account_id)
+    if not versions:
         return api_response(
             "Account not found",
             404,
@@ -45,25 +82,29 @@ def get_account_by_id(account_id: int):
                 "message": "The requested account does not exist or you don't have access to it"}
         )
 
-    return api_response(
+    etag = make_etag('account', versions[0], request.query_string.decode())
+    cached = not_modified(etag, REVALIDATE)
+    if cached:
+        return cached
+
+    account = db.session.get(Account, account_id)
+    data = account.to_dict()
+    if query_data.as_of:
+        data['balance'] = str(balance_as_of(account.id, query_data.as_of))
+        data['as_of'] = query_data.as_of.isoformat()
+
+    return cacheable(api_response(
         "Account retrieved successfully",
         200,
-        data=account.to_dict()
-    )
+        data=data
+    ), etag, REVALIDATE)
 
 
 @accounts_bp.route('', methods=['POST'])
 @jwt_required()
 def create_account():
+    # jwt_required has already confirmed the user exists via the user cache
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-
-    if not user:
-        return api_response(
-            "User not found",
-            404,
-            errors={"message": "The requested user does not exist"}
-        )
 
     data = request.get_json()
     account_data = AccountCreateSchema.validate(data)
@@ -77,16 +118,10 @@ def create_account():
         )
 
     try:
-        # Generate a unique account number
-        while True:
-            account_number = generate_account_number()
-            if not Account.query.filter_by(account_number=account_number).first():
-                break
-
         account = Account(
             user_id=current_user_id,
             account_type=AccountType(account_data.account_type),
-            account_number=account_number,
+            account_number=next_account_number(),
             balance=0.00
         )
 
@@ -120,7 +155,7 @@ def create_account():
 def update_account(account_id: int):
     current_user_id = get_jwt_identity()
     account = Account.query.filter_by(
-        id=account_id, user_id=current_user_id).first()
+        id=account_id, user_id=current_user_id, deleted_at=None).first()
 
     if not account:
         return api_response(
@@ -164,19 +199,28 @@ def update_account(account_id: int):
 @jwt_required()
 def delete_account(account_id: int):
     current_user_id = get_jwt_identity()
-    account = Account.query.filter_by(
-        id=account_id, user_id=current_user_id).first()
 
-    if not account:
-        return api_response(
-            "Account not found",
-            404,
-            errors={
-                "message": "The requested account does not exist or you don't have access to it"}
+    try:
+        # Soft delete in one UPDATE; `flask accounts purge` removes the history
+        result = db.session.execute(
+            update(Account)
+            .where(
+                Account.id == account_id,
+                Account.user_id == current_user_id,
+                Account.deleted_at.is_(None)
+            )
+            .values(deleted_at=datetime.now(timezone.utc))
         )
 
-    try:
-        db.session.delete(account)
+        if not result.rowcount:
+            db.session.rollback()
+            return api_response(
+                "Account not found",
+                404,
+                errors={
+                    "message": "The requested account does not exist or you don't have access to it"}
+            )
+
         db.session.commit()
 
         return api_response(
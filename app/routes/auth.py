@@ -1,8 +1,18 @@
+import math
 from flask import Blueprint, request
-from flask_jwt_extended import create_access_token, create_refresh_token
+from flask_jwt_extended import (
+    create_access_token, create_refresh_token, decode_token,
+    get_jwt, get_jwt_identity, jwt_required
+)
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from app.models.user import User
+from app.services.password_hasher import HasherBusy
 from app.schemas.user_schema import UserLoginSchema
 from app.utils.response import api_response
+from app.utils import throttle, user_cache
+from app.utils.revocation import store as revoked_tokens
 from app import db
 
 auth_bp = Blueprint('auth', __name__)
@@ -16,11 +26,35 @@ def login():
     if not user_data:
         return api_response("Invalid input data", 400, errors={"message": "Missing required fields"})
 
+    # Shed brute-force bursts before the user lookup and bcrypt
+    retry_after = throttle.check_login(user_data.username)
+    if retry_after:
+        response, status_code = api_response(
+            "Too many login attempts",
+            429,
+            errors={"message": "Too many login attempts, please try again later"}
+        )
+        response.headers['Retry-After'] = str(math.ceil(retry_after))
+        return response, status_code
+
     user = User.query.filter_by(username=user_data.username).first()
 
     if not user or not user.check_password(user_data.password):
         return api_response("Invalid credentials", 401)
 
+    throttle.login_succeeded(user_data.username)
+
+    # Upgrade the hash to the configured cost while we have the password
+    if user.password_needs_rehash():
+        try:
+            user.set_password(user_data.password)
+            db.session.commit()
+            user_cache.invalidate(user.id)
+        except HasherBusy:
+            pass  # the password was correct; rehash on a later login
+        except SQLAlchemyError:
+            db.session.rollback()
+
     access_token = create_access_token(identity=str(user.id))
     refresh_token = create_refresh_token(identity=str(user.id))
 
@@ -33,3 +67,59 @@ def login():
             "refresh_token": refresh_token
         }
     )
+
+
+@auth_bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    access_token = create_access_token(identity=get_jwt_identity())
+
+    return api_response(
+        "Token refreshed successfully",
+        200,
+        data={"access_token": access_token}
+    )
+
+
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required(verify_type=False)
+def logout():
+    tokens = [get_jwt()]
+
+    # The access token and its refresh token can be revoked in one call
+    data = request.get_json(silent=True) or {}
+    refresh_token = data.get('refresh_token')
+    if refresh_token:
+        try:
+            decoded = decode_token(refresh_token)
+        except (JWTExtendedException, PyJWTError):
+            decoded = None
+        if not decoded or decoded['type'] != 'refresh' or decoded['sub'] != tokens[0]['sub']:
+            return api_response(
+                "Invalid input data",
+                400,
+                errors={"message": "refresh_token is not a valid refresh token for this user"}
+            )
+        tokens.append(decoded)
+
+    tokens = [token for token in tokens
+              if not revoked_tokens.is_revoked(token['jti'])]
+    try:
+        for token in tokens:
+            revoked_tokens.save(token)
+        db.session.commit()
+    except IntegrityError:
+        # Revoked concurrently by another request, which is what we want
+        db.session.rollback()
+    except SQLAlchemyError:
+        db.session.rollback()
+        return api_response(
+            "Database error occurred",
+            500,
+            errors={"message": "An error occurred while logging out"}
+        )
+
+    for token in tokens:
+        revoked_tokens.remember(token)
+
+    return api_response("Logout successful", 200)
@@ -0,0 +1,37 @@
+import hmac
+import os
+from flask import Blueprint, current_app, request
+from app.utils.pool_metrics import pool_stats
+from app.utils.response import api_response
+from app import db
+
+health_bp = Blueprint('health', __name__)
+
+
+@health_bp.route('/pool', methods=['GET'])
+def get_pool_stats():
+    # Internal only: off unless a token is configured, which scrapers send
+    token = current_app.config.get('POOL_STATS_TOKEN')
+    if not token:
+        return api_response("Not found", 404)
+    if not hmac.compare_digest(
+            request.headers.get('X-Metrics-Token', '').encode(), token.encode()):
+        return api_response(
+            "Unauthorized",
+            401,
+            errors={"message": "A valid X-Metrics-Token header is required"}
+        )
+
+    # Pools are per process; scrape every worker and sum up to compare
+    # against the server's max_connections
+    return api_response(
+        "Pool statistics retrieved successfully",
+        200,
+        data={
+            "pid": os.getpid(),
+            "engines": {
+                key or "primary": pool_stats(engine)
+                for key, engine in db.engines.items()
+            }
+        }
+    )
@@ -1,9 +1,14 @@
-from flask import Blueprint, request
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from flask import Blueprint, Response, request, stream_with_context, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import or_
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import false, insert, or_, select, tuple_, union_all
+from sqlalchemy.orm import aliased
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from app.models.account import Account
-from app.models import Transaction, TransactionType
+from app.models import Transaction, TransactionType, TransferIntent
 from app.schemas import (
     TransactionDepositSchema,
     TransactionTransferSchema,
@@ -11,68 +16,146 @@ from app.schemas import (
     TransactionFilterSchema
 )
 from app.utils.response import api_response
+from app.utils.replicas import replica_reads
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.conditional import IMMUTABLE, cacheable, make_etag, not_modified
+from app.services import ledger
+from app.services.balance_snapshots import balance_as_of
+from app.services.rollups import summarize
+from app.utils import idempotency
+from app.utils.ownership import owned_account_ids_select, user_account_ids
 from app import db
 
 transactions_bp = Blueprint('transactions', __name__)
 
 
-@transactions_bp.route('', methods=['GET'])
-@jwt_required()
-def get_transactions():
-    current_user_id = get_jwt_identity()
+NEWEST_FIRST = (Transaction.created_at.desc(), Transaction.id.desc())
 
-    # Get user's accounts
-    user_accounts = Account.query.filter_by(user_id=current_user_id).all()
-    if not user_accounts:
-        return api_response(
-            "Transactions retrieved successfully",
-            200,
-            data=[]
-        )
 
-    account_ids = [account.id for account in user_accounts]
+def filtered_transaction_branches(current_user_id, filter_data: TransactionFilterSchema):
+    """Build the WHERE clauses for the user's transactions and filters.
 
-    # Build base query for transactions related to user's accounts
-    query = Transaction.query.filter(
-        or_(
-            Transaction.from_account_id.in_(account_ids),
-            Transaction.to_account_id.in_(account_ids)
-        )
-    )
+    Returns a (branches, error_response) pair; exactly one of them is None.
+    Each account gets two disjoint branches: transactions sent from it, and
+    transactions it received from outside the user's accounts. Every branch
+    pins the leading column of an (account_id, created_at, id) index, so it
+    is read in created_at order and stops at the page limit; an IN list of
+    several accounts could not be, and forced reading and sorting all of
+    the user's rows.
+    """
+    owned = sorted(user_account_ids(current_user_id))
 
     # Apply filters if provided
-    filter_data = TransactionFilterSchema.validate(request.args)
-
+    account_ids = owned
     if filter_data.account_id:
-        if filter_data.account_id not in account_ids:
-            return api_response(
+        if filter_data.account_id not in owned:
+            return None, api_response(
                 "Account not found",
                 404,
                 errors={
                     "message": "The specified account does not exist or you don't have access to it"}
             )
-        query = query.filter(
-            or_(
-                Transaction.from_account_id == filter_data.account_id,
-                Transaction.to_account_id == filter_data.account_id
-            )
-        )
+        account_ids = [filter_data.account_id]
+
+    if not account_ids:
+        return [[false()]], None
 
+    common = []
     if filter_data.start_date:
-        query = query.filter(Transaction.created_at >= filter_data.start_date)
+        common.append(Transaction.created_at >= filter_data.start_date)
 
     if filter_data.end_date:
-        query = query.filter(Transaction.created_at <= filter_data.end_date)
+        common.append(Transaction.created_at <= filter_data.end_date)
+
+    # Transfers between two of the accounts are already in a sent branch
+    from_elsewhere = or_(
+        Transaction.from_account_id.is_(None),
+        Transaction.from_account_id.not_in(account_ids)
+    )
+    branches = []
+    for account_id in account_ids:
+        branches.append([Transaction.from_account_id == account_id, *common])
+        branches.append([Transaction.to_account_id == account_id, from_elsewhere, *common])
+    return branches, None
+
+
+def transactions_page_query(branches, page_size: int):
+    """The newest page_size transactions matching any of the branches.
+
+    Each branch reads at most page_size rows from its index, newest first;
+    the merge keeps the top of them all, with id breaking ties between
+    equal timestamps.
+    """
+    merged = aliased(Transaction, union_all(*(
+        select(
+            select(Transaction).where(*branch)
+            .order_by(*NEWEST_FIRST).limit(page_size).subquery()
+        )
+        for branch in branches
+    )).subquery())
+    return select(merged).order_by(
+        merged.created_at.desc(),
+        merged.id.desc()
+    ).limit(page_size)
+
+
+@transactions_bp.route('', methods=['GET'])
+@replica_reads
+@jwt_required()
+def get_transactions():
+    current_user_id = get_jwt_identity()
+    filter_data = TransactionFilterSchema.validate(request.args)
+
+    branches, error = filtered_transaction_branches(
+        current_user_id, filter_data)
+    if error:
+        return error
 
-    # Order by most recent first
-    query = query.order_by(Transaction.created_at.desc())
+    # Resume strictly after the last row of the previous page
+    if filter_data.cursor:
+        position = decode_cursor(filter_data.cursor)
+        if not position:
+            return api_response(
+                "Invalid input data",
+                400,
+                errors={"message": "Invalid pagination cursor"}
+            )
+        branches = [
+            [*branch, tuple_(Transaction.created_at, Transaction.id) < position]
+            for branch in branches
+        ]
+
+    # One extra row tells whether another page exists
+    stmt = transactions_page_query(branches, filter_data.limit + 1)
 
     try:
-        transactions = query.all()
+        # Fetch one extra row to know whether another page exists
+        transactions = db.session.scalars(stmt).all()
+        next_cursor = None
+        if len(transactions) > filter_data.limit:
+            transactions = transactions[:filter_data.limit]
+            last = transactions[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        meta = {"limit": filter_data.limit, "next_cursor": next_cursor}
+
+        # Statement view: balances around the requested range of one account
+        if filter_data.account_id:
+            meta["opening_balance"] = str(balance_as_of(
+                filter_data.account_id,
+                filter_data.start_date or datetime.min.replace(tzinfo=timezone.utc),
+                inclusive=False
+            ))
+            meta["closing_balance"] = str(balance_as_of(
+                filter_data.account_id,
+                filter_data.end_date or datetime.now(timezone.utc)
+            ))
+
         return api_response(
             "Transactions retrieved successfully",
             200,
-            data=[transaction.to_dict() for transaction in transactions]
+            data=transactions,
+            meta=meta
         )
     except SQLAlchemyError as e:
         return api_response(
@@ -82,33 +165,139 @@ def get_transactions():
         )
 
 
-@transactions_bp.route('/<int:transaction_id>', methods=['GET'])
+@transactions_bp.route('/summary', methods=['GET'])
+@replica_reads
 @jwt_required()
-def get_transaction(transaction_id: int):
+def get_transaction_summary():
+    current_user_id = get_jwt_identity()
+    filter_data = TransactionFilterSchema.validate(request.args)
+
+    account_ids = owned_account_ids_select(current_user_id)
+
+    if filter_data.account_id:
+        if filter_data.account_id not in user_account_ids(current_user_id):
+            return api_response(
+                "Account not found",
+                404,
+                errors={
+                    "message": "The specified account does not exist or you don't have access to it"}
+            )
+        account_ids = [filter_data.account_id]
+
+    # Served from the monthly rollups: cost grows with months, not rows
+    rollups = summarize(
+        account_ids,
+        filter_data.start_date.date() if filter_data.start_date else None,
+        filter_data.end_date.date() if filter_data.end_date else None
+    )
+
+    return api_response(
+        "Transaction summary retrieved successfully",
+        200,
+        data=[rollup.to_dict() for rollup in rollups]
+    )
+
+
+EXPORT_FIELDS = [
+    'id',
+    'from_account_id',
+    'to_account_id',
+    'amount',
+    'type',
+    'description',
+    'created_at'
+]
+EXPORT_BATCH_SIZE = 1000
+
+
+def _export_ndjson(transactions):
+    for transaction in transactions:
+        yield json.dumps(transaction.to_dict()) + '\n'
+
+
+def _export_csv(transactions):
+    # One reusable buffer; each row is written, drained and cleared
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for transaction in transactions:
+        writer.writerow(transaction.to_dict())
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+EXPORT_FORMATS = {
+    'ndjson': (_export_ndjson, 'application/x-ndjson'),
+    'csv': (_export_csv, 'text/csv'),
+}
+
+
+@transactions_bp.route('/export', methods=['GET'])
+@replica_reads
+@jwt_required()
+def export_transactions():
     current_user_id = get_jwt_identity()
+    export_format = request.args.get('format', 'ndjson').lower()
 
-    # Get user's accounts
-    user_accounts = Account.query.filter_by(user_id=current_user_id).all()
-    if not user_accounts:
+    if export_format not in EXPORT_FORMATS:
         return api_response(
-            "Transaction not found",
-            404,
-            errors={
-                "message": "The specified transaction does not exist or you don't have access to it"}
+            "Invalid input data",
+            400,
+            errors={"message": "Export format must be 'ndjson' or 'csv'"}
         )
 
-    account_ids = [account.id for account in user_accounts]
+    filter_data = TransactionFilterSchema.validate(request.args)
+    branches, error = filtered_transaction_branches(
+        current_user_id, filter_data)
+    if error:
+        return error
+
+    # Server-side cursor: rows are fetched and serialized in fixed-size
+    # batches so memory does not grow with the size of the history. The
+    # ordered UNION ALL lets Postgres merge the branches' index scans as it
+    # streams.
+    merged = aliased(Transaction, union_all(*(
+        select(Transaction).where(*branch) for branch in branches
+    )).subquery())
+    stmt = (
+        select(merged)
+        .order_by(merged.created_at.asc(), merged.id.asc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    # Executed lazily, inside the streamed response's context
+    def transactions():
+        yield from db.session.scalars(stmt)
+
+    serialize, mimetype = EXPORT_FORMATS[export_format]
+    return Response(
+        stream_with_context(serialize(transactions())),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f"attachment; filename=transactions.{export_format}"
+        }
+    )
+
 
-    # Find transaction that involves user's accounts
-    transaction = Transaction.query.filter(
+@transactions_bp.route('/<int:transaction_id>', methods=['GET'])
+@replica_reads
+@jwt_required()
+def get_transaction(transaction_id: int):
+    current_user_id = get_jwt_identity()
+    account_ids = owned_account_ids_select(current_user_id)
+
+    # Ownership is checked on the id alone so a revalidation never loads the row
+    found = db.session.scalar(select(Transaction.id).where(
         Transaction.id == transaction_id,
         or_(
             Transaction.from_account_id.in_(account_ids),
             Transaction.to_account_id.in_(account_ids)
         )
-    ).first()
+    ))
 
-    if not transaction:
+    if not found:
         return api_response(
             "Transaction not found",
             404,
@@ -116,11 +305,18 @@ def get_transaction(transaction_id: int):
                 "message": "The specified transaction does not exist or you don't have access to it"}
         )
 
-    return api_response(
+    # Transactions never change after insert, so the id is a permanent version
+    etag = make_etag('transaction', transaction_id)
+    cached = not_modified(etag, IMMUTABLE)
+    if cached:
+        return cached
+
+    transaction = db.session.get(Transaction, transaction_id)
+    return cacheable(api_response(
         "Transaction retrieved successfully",
         200,
-        data=transaction.to_dict()
-    )
+        data=transaction
+    ), etag, IMMUTABLE)
 
 
 @transactions_bp.route('', methods=['POST'])
@@ -129,6 +325,20 @@ def create_transaction():
     current_user_id = get_jwt_identity()
     data = request.get_json()
 
+    # Replay a retried request without touching the handle_* path
+    idempotency_key = request.headers.get(idempotency.IDEMPOTENCY_HEADER)
+    if idempotency_key:
+        if len(idempotency_key) > idempotency.MAX_KEY_LENGTH:
+            return api_response(
+                "Invalid input data",
+                400,
+                errors={"message": "Idempotency-Key must be at most 255 characters"}
+            )
+        request_hash = idempotency.request_fingerprint(data)
+        stored = idempotency.lookup(current_user_id, idempotency_key)
+        if stored:
+            return idempotency.replay(stored, request_hash)
+
     if 'type' not in data:
         return api_response(
             "Invalid input data",
@@ -144,12 +354,12 @@ def create_transaction():
             errors={"message": "account_id is required"}
         )
 
-    from_account = Account.query.filter_by(
-        id=data['account_id'],
-        user_id=current_user_id
-    ).first()
+    try:
+        account_id = int(data['account_id'])
+    except (ValueError, TypeError):
+        account_id = None
 
-    if not from_account:
+    if account_id not in user_account_ids(current_user_id):
         return api_response(
             "Account not found",
             404,
@@ -161,11 +371,14 @@ def create_transaction():
 
     try:
         if transaction_type == TransactionType.DEPOSIT.value:
-            return handle_deposit(data, from_account)
+            response, status_code = handle_deposit(data, account_id)
         elif transaction_type == TransactionType.WITHDRAWAL.value:
-            return handle_withdrawal(data, from_account)
+            response, status_code = handle_withdrawal(data, account_id)
+        elif transaction_type == TransactionType.TRANSFER.value and prefers_async():
+            response, status_code = handle_transfer_async(
+                data, account_id, current_user_id)
         elif transaction_type == TransactionType.TRANSFER.value:
-            return handle_transfer(data, from_account)
+            response, status_code = handle_transfer(data, account_id)
         else:
             return api_response(
                 "Invalid transaction type",
@@ -174,6 +387,36 @@ def create_transaction():
                     "message": "Transaction type must be 'deposit', 'withdrawal', or 'transfer'"}
             )
 
+        if status_code not in (201, 202):
+            db.session.rollback()
+            return response, status_code
+
+        # The key is committed in the same DB transaction as the Transaction
+        stored = None
+        if idempotency_key:
+            stored = idempotency.save(
+                current_user_id, idempotency_key, request_hash,
+                response, status_code)
+
+        db.session.commit()
+
+        if stored:
+            idempotency.remember(current_user_id, idempotency_key, stored)
+
+        return response, status_code
+
+    except IntegrityError:
+        db.session.rollback()
+        # A concurrent request with the same key won the race
+        stored = idempotency_key and idempotency.lookup(
+            current_user_id, idempotency_key)
+        if stored:
+            return idempotency.replay(stored, request_hash)
+        return api_response(
+            "Database integrity error",
+            409,
+            errors={"message": "Could not create the transaction due to a conflict"}
+        )
     except SQLAlchemyError as e:
         db.session.rollback()
         return api_response(
@@ -183,7 +426,7 @@ def create_transaction():
         )
 
 
-def handle_deposit(data: dict, to_account: Account):
+def handle_deposit(data: dict, to_account_id: int):
     transaction_data = TransactionDepositSchema.validate(data)
     if not transaction_data:
         return api_response(
@@ -192,18 +435,22 @@ def handle_deposit(data: dict, to_account: Account):
             errors={"message": "Invalid or missing amount. Amount must be positive."}
         )
 
-    transaction = Transaction(
-        to_account_id=to_account.id,
-        amount=transaction_data.amount,
-        type=TransactionType.DEPOSIT,
-        description=transaction_data.description
-    )
-
     # Update account balance
-    to_account.balance += transaction_data.amount
+    to_account = ledger.credit(to_account_id, transaction_data.amount)
+    if not to_account:
+        return api_response(
+            "Account not found",
+            404,
+            errors={
+                "message": "The specified account does not exist or you don't have access to it"}
+        )
 
-    db.session.add(transaction)
-    db.session.commit()
+    transaction, = ledger.record_transactions([{
+        "to_account_id": to_account.id,
+        "amount": transaction_data.amount,
+        "type": TransactionType.DEPOSIT,
+        "description": transaction_data.description
+    }])
 
     return api_response(
         "Transaction created successfully",
@@ -215,7 +462,7 @@ def handle_deposit(data: dict, to_account: Account):
     )
 
 
-def handle_withdrawal(data: dict, from_account: Account):
+def handle_withdrawal(data: dict, from_account_id: int):
     transaction_data = TransactionWithdrawalSchema.validate(data)
     if not transaction_data:
         return api_response(
@@ -224,8 +471,9 @@ def handle_withdrawal(data: dict, from_account: Account):
             errors={"message": "Invalid or missing amount. Amount must be positive."}
         )
 
-    # Check if account has sufficient funds
-    if from_account.balance < transaction_data.amount:
+    # Check funds and update the balance in a single conditional UPDATE
+    from_account = ledger.debit(from_account_id, transaction_data.amount)
+    if not from_account:
         return api_response(
             "Insufficient funds",
             400,
@@ -233,18 +481,12 @@ def handle_withdrawal(data: dict, from_account: Account):
                 "message": "Your account balance is insufficient for this withdrawal"}
         )
 
-    transaction = Transaction(
-        from_account_id=from_account.id,
-        amount=transaction_data.amount,
-        type=TransactionType.WITHDRAWAL,
-        description=transaction_data.description
-    )
-
-    # Update account balance
-    from_account.balance -= transaction_data.amount
-
-    db.session.add(transaction)
-    db.session.commit()
+    transaction, = ledger.record_transactions([{
+        "from_account_id": from_account.id,
+        "amount": transaction_data.amount,
+        "type": TransactionType.WITHDRAWAL,
+        "description": transaction_data.description
+    }])
 
     return api_response(
         "Transaction created successfully",
@@ -256,7 +498,7 @@ def handle_withdrawal(data: dict, from_account: Account):
     )
 
 
-def handle_transfer(data: dict, from_account: Account):
+def handle_transfer(data: dict, from_account_id: int):
     transaction_data = TransactionTransferSchema.validate(data)
     if not transaction_data:
         return api_response(
@@ -266,8 +508,22 @@ def handle_transfer(data: dict, from_account: Account):
                 "message": "Invalid or missing fields. Required: amount (positive) and to_account_id"}
         )
 
-    # Check if sender has sufficient funds
-    if from_account.balance < transaction_data.amount:
+    # Prevent transfer to same account
+    if from_account_id == transaction_data.to_account_id:
+        return api_response(
+            "Invalid transfer",
+            400,
+            errors={"message": "Cannot transfer to the same account"}
+        )
+
+    # Update account balances; funds and receiver are checked by the UPDATEs
+    from_account, to_account, error = ledger.transfer(
+        from_account_id,
+        transaction_data.to_account_id,
+        transaction_data.amount
+    )
+
+    if error == ledger.INSUFFICIENT_FUNDS:
         return api_response(
             "Insufficient funds",
             400,
@@ -275,44 +531,315 @@ def handle_transfer(data: dict, from_account: Account):
                 "message": "Your account balance is insufficient for this transfer"}
         )
 
-    # Validate receiver account exists
-    to_account = Account.query.get(transaction_data.to_account_id)
-    if not to_account:
+    if error == ledger.ACCOUNT_NOT_FOUND:
         return api_response(
             "Receiver account not found",
             404,
             errors={"message": "The recipient account does not exist"}
         )
 
+    transaction, = ledger.record_transactions([{
+        "from_account_id": from_account.id,
+        "to_account_id": to_account.id,
+        "amount": transaction_data.amount,
+        "type": TransactionType.TRANSFER,
+        "description": transaction_data.description
+    }])
+
+    ledger.load_slot_totals([from_account, to_account])
+    return api_response(
+        "Transaction created successfully",
+        201,
+        data={
+            "transaction": transaction.to_dict(),
+            "from_account": from_account.to_dict(),
+            "to_account": to_account.to_dict()
+        }
+    )
+
+
+def prefers_async() -> bool:
+    """True when the client sent an RFC 7240 'Prefer: respond-async' header."""
+    preferences = request.headers.get('Prefer', '')
+    return any(
+        preference.split(';')[0].strip().lower() == 'respond-async'
+        for preference in preferences.split(',')
+    )
+
+
+def handle_transfer_async(data: dict, from_account_id: int, user_id):
+    transaction_data = TransactionTransferSchema.validate(data)
+    if not transaction_data:
+        return api_response(
+            "Invalid input data",
+            400,
+            errors={
+                "message": "Invalid or missing fields. Required: amount (positive) and to_account_id"}
+        )
+
     # Prevent transfer to same account
-    if from_account.id == to_account.id:
+    if from_account_id == transaction_data.to_account_id:
         return api_response(
             "Invalid transfer",
             400,
             errors={"message": "Cannot transfer to the same account"}
         )
 
-    transaction = Transaction(
-        from_account_id=from_account.id,
-        to_account_id=to_account.id,
-        amount=transaction_data.amount,
-        type=TransactionType.TRANSFER,
-        description=transaction_data.description
+    # Funds and receiver are checked when a worker applies the intent
+    intent = db.session.scalars(
+        insert(TransferIntent).returning(TransferIntent),
+        [{
+            "user_id": user_id,
+            "from_account_id": from_account_id,
+            "to_account_id": transaction_data.to_account_id,
+            "amount": transaction_data.amount,
+            "description": transaction_data.description
+        }]
+    ).one()
+
+    status_url = url_for(
+        'transactions.get_transfer_intent', intent_id=intent.id)
+    response, status_code = api_response(
+        "Transfer accepted for processing",
+        202,
+        data={
+            "intent": intent.to_dict(),
+            "status_url": status_url
+        }
     )
+    response.headers['Location'] = status_url
+    return response, status_code
 
-    # Update account balances
-    from_account.balance -= transaction_data.amount
-    to_account.balance += transaction_data.amount
 
-    db.session.add(transaction)
-    db.session.commit()
+@transactions_bp.route('/intents/<int:intent_id>', methods=['GET'])
+@jwt_required()
+def get_transfer_intent(intent_id: int):
+    current_user_id = get_jwt_identity()
+    intent = TransferIntent.query.filter_by(
+        id=intent_id, user_id=current_user_id).first()
+
+    if not intent:
+        return api_response(
+            "Transfer not found",
+            404,
+            errors={
+                "message": "The specified transfer does not exist or you don't have access to it"}
+        )
+
+    data = {"intent": intent.to_dict()}
+    if intent.transaction_id:
+        transaction = db.session.get(Transaction, intent.transaction_id)
+        data["transaction"] = transaction.to_dict() if transaction else None
 
     return api_response(
-        "Transaction created successfully",
-        201,
+        "Transfer status retrieved successfully",
+        200,
+        data=data
+    )
+
+
+BATCH_MAX_OPERATIONS = 500
+
+BATCH_SCHEMAS = {
+    TransactionType.DEPOSIT.value: TransactionDepositSchema,
+    TransactionType.WITHDRAWAL.value: TransactionWithdrawalSchema,
+    TransactionType.TRANSFER.value: TransactionTransferSchema,
+}
+
+
+def _batch_error(index: int, message: str, status_code: int, detail: str) -> dict:
+    return {
+        "index": index,
+        "status": "error",
+        "status_code": status_code,
+        "message": message,
+        "errors": {"message": detail}
+    }
+
+
+def _validate_batch_operation(index: int, operation):
+    """Validate one batch item, returning (account_id, type, data) or an error."""
+    if not isinstance(operation, dict) or 'type' not in operation:
+        return None, _batch_error(
+            index, "Invalid input data", 400, "Transaction type is required")
+
+    if 'account_id' not in operation:
+        return None, _batch_error(
+            index, "Invalid input data", 400, "account_id is required")
+
+    try:
+        account_id = int(operation['account_id'])
+    except (ValueError, TypeError):
+        return None, _batch_error(
+            index, "Invalid input data", 400, "account_id must be an integer")
+
+    transaction_type = str(operation['type']).lower()
+    schema = BATCH_SCHEMAS.get(transaction_type)
+    if not schema:
+        return None, _batch_error(
+            index, "Invalid transaction type", 400,
+            "Transaction type must be 'deposit', 'withdrawal', or 'transfer'")
+
+    transaction_data = schema.validate(operation)
+    if not transaction_data:
+        return None, _batch_error(
+            index, "Invalid input data", 400,
+            "Invalid or missing fields. Amount must be positive and transfers require to_account_id")
+
+    return (account_id, transaction_type, transaction_data), None
+
+
+@transactions_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def create_transactions_batch():
+    current_user_id = int(get_jwt_identity())
+    data = request.get_json()
+    operations = data.get('operations') if isinstance(data, dict) else None
+
+    if not isinstance(operations, list) or not operations:
+        return api_response(
+            "Invalid input data",
+            400,
+            errors={"message": "operations must be a non-empty list"}
+        )
+
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        return api_response(
+            "Invalid input data",
+            400,
+            errors={
+                "message": f"A batch may contain at most {BATCH_MAX_OPERATIONS} operations"}
+        )
+
+    results = [None] * len(operations)
+    validated = []
+    for index, operation in enumerate(operations):
+        item, error = _validate_batch_operation(index, operation)
+        if error:
+            results[index] = error
+        else:
+            validated.append((index, *item))
+
+    try:
+        # Load and lock every involved account in one query. Locking in id
+        # order keeps concurrent batches and single transfers deadlock-free.
+        account_ids = {account_id for _, account_id, _, _ in validated}
+        account_ids.update(
+            transaction_data.to_account_id
+            for _, _, transaction_type, transaction_data in validated
+            if transaction_type == TransactionType.TRANSFER.value
+        )
+        accounts = {
+            account.id: account
+            for account in Account.query.filter(
+                Account.id.in_(account_ids), Account.deleted_at.is_(None))
+            .order_by(Account.id)
+            .with_for_update()
+            .all()
+        } if account_ids else {}
+        # Credits parked in slots of hot accounts count towards their funds
+        parked = ledger.slot_totals([
+            account.id for account in accounts.values() if account.balance_slots
+        ])
+
+        # Apply operations in request order against the locked balances
+        rows = []
+        applied = []
+        for index, account_id, transaction_type, transaction_data in validated:
+            account = accounts.get(account_id)
+            if not account or account.user_id != current_user_id:
+                results[index] = _batch_error(
+                    index, "Account not found", 404,
+                    "The specified account does not exist or you don't have access to it")
+                continue
+
+            amount = transaction_data.amount
+            row = {
+                "amount": amount,
+                "description": transaction_data.description,
+            }
+
+            if transaction_type == TransactionType.DEPOSIT.value:
+                account.balance += amount
+                row.update(to_account_id=account.id,
+                           type=TransactionType.DEPOSIT)
+
+            elif transaction_type == TransactionType.WITHDRAWAL.value:
+                if account.balance + parked.get(account.id, 0) < amount:
+                    results[index] = _batch_error(
+                        index, "Insufficient funds", 400,
+                        "Your account balance is insufficient for this withdrawal")
+                    continue
+                account.balance -= amount
+                row.update(from_account_id=account.id,
+                           type=TransactionType.WITHDRAWAL)
+
+            else:
+                to_account = accounts.get(transaction_data.to_account_id)
+                if account.balance + parked.get(account.id, 0) < amount:
+                    results[index] = _batch_error(
+                        index, "Insufficient funds", 400,
+                        "Your account balance is insufficient for this transfer")
+                    continue
+                if not to_account:
+                    results[index] = _batch_error(
+                        index, "Receiver account not found", 404,
+                        "The recipient account does not exist")
+                    continue
+                if account.id == to_account.id:
+                    results[index] = _batch_error(
+                        index, "Invalid transfer", 400,
+                        "Cannot transfer to the same account")
+                    continue
+                account.balance -= amount
+                to_account.balance += amount
+                row.update(from_account_id=account.id,
+                           to_account_id=to_account.id,
+                           type=TransactionType.TRANSFER)
+
+            rows.append(row)
+            applied.append(index)
+
+        # Single multi-row INSERT ... RETURNING for all accepted operations;
+        # the dirty account balances are flushed by the same commit
+        if rows:
+            transactions = ledger.record_transactions(rows)
+            for index, transaction in zip(applied, transactions):
+                results[index] = {
+                    "index": index,
+                    "status": "success",
+                    "status_code": 201,
+                    "transaction": transaction.to_dict()
+                }
+
+        db.session.commit()
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return api_response(
+            "Database error occurred",
+            500,
+            errors={"message": "An error occurred while processing the batch"}
+        )
+
+    if len(applied) == len(operations):
+        message, status_code = "Batch processed successfully", 201
+    elif applied:
+        message, status_code = "Batch partially processed", 207
+    else:
+        message, status_code = "No operations in the batch could be processed", 400
+
+    # Slot sums are unchanged: the batch credits hot accounts at their base
+    ledger.load_slot_totals(accounts.values(), parked)
+    return api_response(
+        message,
+        status_code,
         data={
-            "transaction": transaction.to_dict(),
-            "from_account": from_account.to_dict(),
-            "to_account": to_account.to_dict()
+            "results": results,
+            "accounts": [
+                accounts[account_id].to_dict()
+                for account_id in sorted(accounts)
+                if accounts[account_id].user_id == current_user_id
+            ]
         }
     )
@@ -1,31 +1,42 @@
+from typing import Optional
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
+from sqlalchemy import insert
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from app.models.user import User
 from app.schemas.user_schema import UserSignupSchema, UserUpdateSchema
+from app.services.password_hasher import hasher
 from app.utils.response import api_response
+from app.utils.replicas import replica_reads
+from app.utils import user_cache
 from app import db
 
 users_bp = Blueprint('users', __name__)
 
 
+def conflicting_field(error: IntegrityError) -> Optional[str]:
+    """Which unique column a users INSERT collided on.
+
+    PostgreSQL reports the constraint name (users_username_key); sqlite
+    names the column in its message.
+    """
+    diag = getattr(error.orig, 'diag', None)
+    detail = getattr(diag, 'constraint_name', None) or str(error.orig)
+    for field in ('username', 'email'):
+        if field in detail:
+            return field
+    return None
+
+
 @users_bp.route('/me', methods=['GET'])
+@replica_reads
 @jwt_required()
 def get_current_user():
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-
-    if not user:
-        return api_response(
-            "User not found",
-            404,
-            errors={"message": "The requested user does not exist"}
-        )
-
+    # Loaded from the user cache by jwt_required, which answers 404 if missing
     return api_response(
         "User profile retrieved successfully",
         200,
-        data=user.to_dict()
+        data=current_user.to_dict()
     )
 
 
@@ -33,7 +44,7 @@ def get_current_user():
 @jwt_required()
 def update_current_user():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = db.session.get(User, int(current_user_id))
 
     if not user:
         return api_response(
@@ -62,6 +73,7 @@ def update_current_user():
             user.set_password(user_data.password)
 
         db.session.commit()
+        user_cache.invalidate(user.id)
 
         return api_response(
             "User updated successfully",
@@ -93,20 +105,13 @@ def create_user():
     if not user_data:
         return api_response("Invalid input data", 400, errors={"message": "Missing required fields"})
 
-    if User.query.filter_by(username=user_data.username).first():
-        return api_response("Username already exists", 409)
-
-    if User.query.filter_by(email=user_data.email).first():
-        return api_response("Email already exists", 409)
-
     try:
-        user = User(
-            username=user_data.username,
-            email=user_data.email
-        )
-        user.set_password(user_data.password)
-
-        db.session.add(user)
+        # One INSERT ... RETURNING; duplicates surface as unique violations
+        user = db.session.scalars(insert(User).returning(User), [{
+            "username": user_data.username,
+            "email": user_data.email,
+            "password_hash": hasher.hash(user_data.password)
+        }]).one()
         db.session.commit()
 
         return api_response(
@@ -115,8 +120,13 @@ def create_user():
             data=user.to_dict()
         )
 
-    except IntegrityError:
+    except IntegrityError as e:
         db.session.rollback()
+        field = conflicting_field(e)
+        if field == 'username':
+            return api_response("Username already exists", 409)
+        if field == 'email':
+            return api_response("Email already exists", 409)
         return api_response(
             "Database integrity error",
             409,
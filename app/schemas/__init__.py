@@ -1,5 +1,5 @@
 from .user_schema import UserSignupSchema, UserLoginSchema, UserUpdateSchema
-from .account_schema import AccountCreateSchema, AccountUpdateSchema
+from .account_schema import AccountCreateSchema, AccountUpdateSchema, AccountQuerySchema
 from .transaction_schema import TransactionDepositSchema, TransactionTransferSchema, TransactionWithdrawalSchema, TransactionFilterSchema
 
 __all__ = [
@@ -8,6 +8,7 @@ __all__ = [
     "UserUpdateSchema",
     "AccountCreateSchema",
     "AccountUpdateSchema",
+    "AccountQuerySchema",
     "TransactionDepositSchema",
     "TransactionTransferSchema",
     "TransactionWithdrawalSchema",
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Optional
 from app.models.account import AccountType
 
@@ -33,3 +34,19 @@ class AccountUpdateSchema:
             return None
 
         return cls(account_type=account_type)
+
+
+@dataclass
+class AccountQuerySchema:
+    as_of: Optional[datetime] = None
+
+    @classmethod
+    def validate(cls, data: dict) -> Optional['AccountQuerySchema']:
+        if not (as_of := data.get('as_of')):
+            return cls()
+
+        # Expecting ISO format, interpreted as UTC like the transaction filters
+        try:
+            return cls(as_of=datetime.fromisoformat(as_of).replace(tzinfo=timezone.utc))
+        except (ValueError, TypeError):
+            return None
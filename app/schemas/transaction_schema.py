@@ -4,6 +4,9 @@ from decimal import Decimal, InvalidOperation
 from datetime import datetime, timezone
 from app.models import TransactionType
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
 
 @dataclass
 class TransactionDepositSchema:
@@ -82,6 +85,8 @@ class TransactionFilterSchema:
     account_id: Optional[int] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
+    limit: int = DEFAULT_PAGE_SIZE
+    cursor: Optional[str] = None
 
     @classmethod
     def validate(cls, data: dict) -> 'TransactionFilterSchema':
@@ -109,4 +114,14 @@ class TransactionFilterSchema:
             except (ValueError, TypeError):
                 pass
 
+        # Page size is clamped rather than rejected
+        if limit := data.get('limit'):
+            try:
+                filter_data['limit'] = min(max(int(limit), 1), MAX_PAGE_SIZE)
+            except (ValueError, TypeError):
+                pass
+
+        if cursor := data.get('cursor'):
+            filter_data['cursor'] = cursor
+
         return cls(**filter_data)
@@ -0,0 +1,95 @@
+"""Background purge of soft-deleted accounts.
+
+History is deleted in bounded, set-based chunks, one short DB transaction
+each, so the purge never holds locks for long. Transfers with an account
+that is still open, or deleted but still inside its grace period (it may
+yet be restored), are kept, since they are part of that account's history
+too; the deleted account row stays behind as a tombstone for them. Such a
+transfer goes once both sides are past the grace period.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+from sqlalchemy import and_, delete, or_, select, text, update
+from app.models.account import Account
+from app.models.account_balance_slot import AccountBalanceSlot
+from app.models.balance_snapshot import AccountBalanceSnapshot
+from app.models.posting import Posting
+from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionRollup
+from app import db
+
+
+def _allow_posting_deletes() -> None:
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(text("SET LOCAL ledger.purge = 'on'"))
+
+
+def _purge_transactions(account_id: int, cutoff: datetime, chunk_size: int) -> int:
+    expired_accounts = select(Account.id).where(Account.deleted_at < cutoff)
+    # Deposits, withdrawals, and transfers whose other side is past its
+    # grace period too
+    owned_only = or_(
+        and_(Transaction.from_account_id == account_id,
+             or_(Transaction.to_account_id.is_(None),
+                 Transaction.to_account_id.in_(expired_accounts))),
+        and_(Transaction.to_account_id == account_id,
+             or_(Transaction.from_account_id.is_(None),
+                 Transaction.from_account_id.in_(expired_accounts))),
+    )
+
+    purged = 0
+    while True:
+        ids = db.session.scalars(
+            select(Transaction.id).where(owned_only).limit(chunk_size)
+        ).all()
+        if not ids:
+            return purged
+
+        _allow_posting_deletes()
+        db.session.execute(
+            delete(Posting).where(Posting.transaction_id.in_(ids)))
+        db.session.execute(
+            delete(Transaction).where(Transaction.id.in_(ids)))
+        db.session.commit()
+        purged += len(ids)
+
+
+def _purge_rows(model, account_id: int, chunk_size: int) -> None:
+    while True:
+        chunk = select(model.id).where(
+            model.account_id == account_id).limit(chunk_size)
+        result = db.session.execute(
+            delete(model).where(model.id.in_(chunk)))
+        db.session.commit()
+        if result.rowcount < chunk_size:
+            return
+
+
+def purge_deleted_accounts(grace_period: timedelta = timedelta(days=30),
+                           chunk_size: int = 1000) -> Dict[int, int]:
+    """Purge accounts deleted more than grace_period ago.
+
+    Returns the number of transactions removed per account. An interrupted
+    run simply continues with the next one.
+    """
+    cutoff = datetime.now(timezone.utc) - grace_period
+    account_ids = db.session.scalars(
+        select(Account.id)
+        .where(Account.deleted_at < cutoff, Account.purged_at.is_(None))
+        .order_by(Account.id)
+    ).all()
+    db.session.rollback()
+
+    purged = {}
+    for account_id in account_ids:
+        purged[account_id] = _purge_transactions(account_id, cutoff, chunk_size)
+        for model in (TransactionRollup, AccountBalanceSnapshot, AccountBalanceSlot):
+            _purge_rows(model, account_id, chunk_size)
+
+        db.session.execute(
+            update(Account)
+            .where(Account.id == account_id)
+            .values(purged_at=datetime.now(timezone.utc), balance_slots=0)
+        )
+        db.session.commit()
+    return purged
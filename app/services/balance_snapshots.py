@@ -0,0 +1,137 @@
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import case, func, literal, or_, select, union_all, insert
+from app.models.balance_snapshot import AccountBalanceSnapshot
+from app.models.transaction import Transaction
+from app import db
+
+CENTS = Decimal('0.01')
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _net_change(account_id: int, since: Optional[datetime], until: datetime, inclusive: bool) -> Decimal:
+    """Credits minus debits for one account in [since, until]."""
+    signed_amount = case(
+        (Transaction.to_account_id == account_id, Transaction.amount),
+        else_=-Transaction.amount
+    )
+    stmt = select(func.coalesce(func.sum(signed_amount), 0)).where(
+        or_(
+            Transaction.from_account_id == account_id,
+            Transaction.to_account_id == account_id
+        ),
+        Transaction.created_at <= until if inclusive
+        else Transaction.created_at < until
+    )
+    if since is not None:
+        stmt = stmt.where(Transaction.created_at >= since)
+    return db.session.scalar(stmt)
+
+
+def balance_as_of(account_id: int, as_of: datetime, inclusive: bool = True) -> Decimal:
+    """Balance of an account at a point in time.
+
+    Costs one snapshot lookup plus a sum over the transactions written
+    since that snapshot. With inclusive=False, transactions stamped exactly
+    at as_of are excluded (the opening balance of a range).
+    """
+    as_of = as_of.astimezone(timezone.utc)
+    # The snapshot for day d closes at midnight of d + 1, so only days
+    # strictly before as_of's date are fully covered
+    snapshot = db.session.execute(
+        select(AccountBalanceSnapshot.snapshot_date,
+               AccountBalanceSnapshot.balance)
+        .where(
+            AccountBalanceSnapshot.account_id == account_id,
+            AccountBalanceSnapshot.snapshot_date < as_of.date()
+        )
+        .order_by(AccountBalanceSnapshot.snapshot_date.desc())
+        .limit(1)
+    ).first()
+
+    if snapshot:
+        base = snapshot.balance
+        since = _day_start(snapshot.snapshot_date + timedelta(days=1))
+    else:
+        base, since = Decimal(0), None
+
+    balance = base + _net_change(account_id, since, as_of, inclusive)
+    return Decimal(balance).quantize(CENTS)
+
+
+def _build_day(day: date) -> int:
+    """Write snapshots for every account with activity on the given day."""
+    start, end = _day_start(day), _day_start(day + timedelta(days=1))
+
+    movements = union_all(
+        select(Transaction.to_account_id.label('account_id'),
+               Transaction.amount.label('delta'))
+        .where(Transaction.to_account_id.is_not(None),
+               Transaction.created_at >= start,
+               Transaction.created_at < end),
+        select(Transaction.from_account_id.label('account_id'),
+               (-Transaction.amount).label('delta'))
+        .where(Transaction.from_account_id.is_not(None),
+               Transaction.created_at >= start,
+               Transaction.created_at < end),
+    ).subquery()
+
+    daily = (
+        select(movements.c.account_id,
+               func.sum(movements.c.delta).label('net'))
+        .group_by(movements.c.account_id)
+        .subquery()
+    )
+
+    previous = (
+        select(AccountBalanceSnapshot.balance)
+        .where(AccountBalanceSnapshot.account_id == daily.c.account_id,
+               AccountBalanceSnapshot.snapshot_date < day)
+        .order_by(AccountBalanceSnapshot.snapshot_date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    result = db.session.execute(
+        insert(AccountBalanceSnapshot).from_select(
+            ['account_id', 'snapshot_date', 'balance', 'created_at'],
+            select(
+                daily.c.account_id,
+                literal(day, db.Date),
+                func.coalesce(previous, 0) + daily.c.net,
+                literal(datetime.now(timezone.utc), db.DateTime(timezone=True))
+            )
+        )
+    )
+    return result.rowcount
+
+
+def build_snapshots(through: Optional[date] = None) -> dict:
+    """Incrementally snapshot every day after the last one up to `through`.
+
+    Defaults to yesterday (UTC); run it a few minutes after midnight so
+    transactions committed around the day boundary are already visible.
+    Each day is committed on its own, so an interrupted run resumes where
+    it stopped.
+    """
+    through = through or datetime.now(timezone.utc).date() - timedelta(days=1)
+
+    last = db.session.scalar(select(func.max(AccountBalanceSnapshot.snapshot_date)))
+    if last is not None:
+        day = last + timedelta(days=1)
+    else:
+        first = db.session.scalar(select(func.min(Transaction.created_at)))
+        if first is None:
+            return {}
+        day = first.astimezone(timezone.utc).date()
+
+    written = {}
+    while day <= through:
+        written[day] = _build_day(day)
+        db.session.commit()
+        day += timedelta(days=1)
+    return written
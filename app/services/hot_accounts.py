@@ -0,0 +1,100 @@
+"""Hot account mode: credits spread over balance slots.
+
+A hot account (e.g. a merchant receiving many concurrent transfers) keeps
+part of its balance in AccountBalanceSlot rows. Credits update a random
+slot instead of the account row; debits and the fold job lock the account
+row and account for the slots.
+"""
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import delete, insert, select, update
+from app.models.account import Account
+from app.models.account_balance_slot import AccountBalanceSlot
+from app import db
+
+
+def _lock(account_id: int) -> Optional[Account]:
+    return db.session.scalars(
+        select(Account)
+        .where(Account.id == account_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).one_or_none()
+
+
+def _fold(account: Account) -> Decimal:
+    """Move slot balances into the base balance of a locked account.
+
+    Locking the slot rows waits out in-flight credits and blocks new ones
+    until commit, so nothing is lost between the read and the reset.
+    """
+    balances = db.session.scalars(
+        select(AccountBalanceSlot.balance)
+        .where(AccountBalanceSlot.account_id == account.id)
+        .order_by(AccountBalanceSlot.slot)
+        .with_for_update()
+    ).all()
+    total = sum(balances, Decimal(0))
+    if total:
+        db.session.execute(
+            update(AccountBalanceSlot)
+            .where(AccountBalanceSlot.account_id == account.id)
+            .values(balance=0)
+            .execution_options(synchronize_session=False)
+        )
+        account.balance += total
+    return total
+
+
+def enable(account_id: int, slots: int) -> Optional[Account]:
+    """Turn on hot mode for an account, or change its slot count."""
+    account = _lock(account_id)
+    if not account or account.deleted_at:
+        return None
+
+    _fold(account)
+    db.session.execute(
+        delete(AccountBalanceSlot)
+        .where(AccountBalanceSlot.account_id == account_id)
+    )
+    db.session.execute(insert(AccountBalanceSlot), [
+        {"account_id": account_id, "slot": slot, "balance": 0}
+        for slot in range(slots)
+    ])
+    account.balance_slots = slots
+    db.session.commit()
+    return account
+
+
+def disable(account_id: int) -> Optional[Account]:
+    """Fold the slots back into the account and turn hot mode off."""
+    account = _lock(account_id)
+    if not account:
+        return None
+
+    _fold(account)
+    db.session.execute(
+        delete(AccountBalanceSlot)
+        .where(AccountBalanceSlot.account_id == account_id)
+    )
+    account.balance_slots = 0
+    db.session.commit()
+    return account
+
+
+def fold_all() -> dict:
+    """Fold every hot account, one short DB transaction per account."""
+    account_ids = db.session.scalars(
+        select(Account.id)
+        .where(Account.balance_slots > 0)
+        .order_by(Account.id)
+    ).all()
+    db.session.rollback()
+
+    folded = {}
+    for account_id in account_ids:
+        account = _lock(account_id)
+        if account and account.balance_slots:
+            folded[account_id] = _fold(account)
+        db.session.commit()
+    return folded
@@ -0,0 +1,210 @@
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, insert, select, update
+from app.models.account import Account
+from app.models.account_balance_slot import AccountBalanceSlot
+from app.models.posting import Posting, PostingDirection
+from app.models.transaction import Transaction
+from app.services.rollups import apply_rollups
+from app import db
+
+INSUFFICIENT_FUNDS = "insufficient_funds"
+ACCOUNT_NOT_FOUND = "account_not_found"
+
+
+def _credit_base(account_id: int, amount: Decimal) -> Optional[Account]:
+    stmt = (
+        update(Account)
+        .where(
+            Account.id == account_id,
+            Account.deleted_at.is_(None),
+            Account.balance_slots == 0
+        )
+        .values(balance=Account.balance + amount)
+        .returning(Account)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+    return db.session.scalars(stmt).one_or_none()
+
+
+def _credit_slot(account_id: int, amount: Decimal) -> bool:
+    # The uncorrelated subquery picks one random slot row for the UPDATE
+    random_slot = (
+        select(AccountBalanceSlot.id)
+        .join(Account, Account.id == AccountBalanceSlot.account_id)
+        .where(AccountBalanceSlot.account_id == account_id,
+               Account.deleted_at.is_(None))
+        .order_by(func.random())
+        .limit(1)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(AccountBalanceSlot)
+        .where(AccountBalanceSlot.id == random_slot)
+        .values(balance=AccountBalanceSlot.balance + amount)
+        .execution_options(synchronize_session=False)
+    )
+    return db.session.execute(stmt).rowcount > 0
+
+
+def credit(account_id: int, amount: Decimal) -> Optional[Account]:
+    """Add amount to an account in one UPDATE ... RETURNING statement.
+
+    Credits to hot accounts go to a random balance slot instead, so they
+    never wait on the account row lock. Returns the refreshed account, or
+    None if it does not exist.
+    """
+    account = _credit_base(account_id, amount)
+    if account:
+        return account
+
+    if _credit_slot(account_id, amount):
+        return db.session.get(Account, account_id, populate_existing=True)
+
+    # Hot mode may have been switched off between the two statements
+    return _credit_base(account_id, amount)
+
+
+def debit(account_id: int, amount: Decimal) -> Optional[Account]:
+    """Subtract amount from an account only if the balance covers it.
+
+    The balance check and the write happen in the same conditional UPDATE,
+    so concurrent debits can never overdraw the account. Returns the
+    refreshed account, or None if the funds are insufficient.
+    """
+    stmt = (
+        update(Account)
+        .where(
+            Account.id == account_id,
+            Account.deleted_at.is_(None),
+            Account.balance_slots == 0,
+            Account.balance >= amount
+        )
+        .values(balance=Account.balance - amount)
+        .returning(Account)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+    account = db.session.scalars(stmt).one_or_none()
+    if account:
+        return account
+
+    # Hot account: hold the row lock (which the fold job also takes) so the
+    # slot total read by the next statement is current and cannot be folded
+    # twice, then check base plus slots
+    slots = db.session.scalar(
+        select(Account.balance_slots)
+        .where(Account.id == account_id, Account.deleted_at.is_(None))
+        .with_for_update()
+    )
+    if not slots:
+        return None
+
+    available = Account.balance + (
+        select(func.coalesce(func.sum(AccountBalanceSlot.balance), 0))
+        .where(AccountBalanceSlot.account_id == account_id)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(Account)
+        .where(Account.id == account_id, available >= amount)
+        .values(balance=Account.balance - amount)
+        .returning(Account)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+    return db.session.scalars(stmt).one_or_none()
+
+
+def slot_totals(account_ids) -> Dict[int, Decimal]:
+    """Credits parked in balance slots, per hot account."""
+    if not account_ids:
+        return {}
+    rows = db.session.execute(
+        select(AccountBalanceSlot.account_id,
+               func.sum(AccountBalanceSlot.balance))
+        .where(AccountBalanceSlot.account_id.in_(account_ids))
+        .group_by(AccountBalanceSlot.account_id)
+    ).all()
+    return {account_id: total for account_id, total in rows}
+
+
+def load_slot_totals(accounts, totals: Optional[Dict[int, Decimal]] = None) -> None:
+    """Attach slot totals to the hot accounts about to be serialized.
+
+    One grouped query covers all of them, instead of one query per account
+    in total_balance(). Pass totals when the caller already has them.
+    """
+    hot = [account for account in accounts if account.balance_slots]
+    if totals is None:
+        totals = slot_totals([account.id for account in hot])
+    for account in hot:
+        account._slot_total = totals.get(account.id, Decimal(0))
+
+
+def transfer(
+    from_account_id: int,
+    to_account_id: int,
+    amount: Decimal
+) -> Tuple[Optional[Account], Optional[Account], Optional[str]]:
+    """Move amount between two accounts.
+
+    Row locks are taken by the UPDATEs in ascending account id order, so two
+    transfers in opposite directions between the same accounts queue up
+    instead of deadlocking. Returns (from_account, to_account, error); on
+    error the caller must roll back the session.
+    """
+    if from_account_id < to_account_id:
+        from_account = debit(from_account_id, amount)
+        if not from_account:
+            return None, None, INSUFFICIENT_FUNDS
+        to_account = credit(to_account_id, amount)
+        if not to_account:
+            return from_account, None, ACCOUNT_NOT_FOUND
+    else:
+        to_account = credit(to_account_id, amount)
+        if not to_account:
+            return None, None, ACCOUNT_NOT_FOUND
+        from_account = debit(from_account_id, amount)
+        if not from_account:
+            return None, to_account, INSUFFICIENT_FUNDS
+
+    return from_account, to_account, None
+
+
+def _postings(transaction: Transaction) -> List[dict]:
+    """The debit and credit rows of a transaction.
+
+    Deposits debit the outside world (account_id None) and withdrawals
+    credit it, so every transaction balances to zero.
+    """
+    common = {
+        "transaction_id": transaction.id,
+        "amount": transaction.amount,
+        "created_at": transaction.created_at
+    }
+    return [
+        {**common, "account_id": transaction.from_account_id,
+         "direction": PostingDirection.DEBIT},
+        {**common, "account_id": transaction.to_account_id,
+         "direction": PostingDirection.CREDIT},
+    ]
+
+
+def record_transactions(rows: List[dict]) -> List[Transaction]:
+    """Insert transaction rows with one INSERT ... RETURNING statement.
+
+    The returned objects carry the values as stored by the database, in the
+    same order as rows, so responses can be built without a refresh. The
+    postings and monthly rollups are written in the same DB transaction.
+    """
+    transactions = db.session.scalars(
+        insert(Transaction).returning(
+            Transaction, sort_by_parameter_order=True),
+        rows
+    ).all()
+    db.session.execute(insert(Posting), [
+        posting
+        for transaction in transactions
+        for posting in _postings(transaction)
+    ])
+    apply_rollups(transactions)
+    return transactions
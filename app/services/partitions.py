@@ -0,0 +1,278 @@
+"""Monthly range partitioning of the transactions table (PostgreSQL 12+).
+
+The ORM keeps mapping Transaction by id. The partitioned table's primary key
+is (id, created_at) because Postgres requires the partition key in it; ids
+still come from the single transactions_id_seq sequence.
+"""
+import logging
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import text
+from app import db
+
+logger = logging.getLogger(__name__)
+
+PARENT = 'transactions'
+LEGACY = 'transactions_legacy'
+DEFAULT_PARTITION = 'transactions_default'
+
+_BOUND = re.compile(
+    r"FROM \((?:MINVALUE|'(?P<lower>[^']+)')\) TO \((?:MAXVALUE|'(?P<upper>[^']+)')\)")
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound_literal(day: date) -> str:
+    return f"'{day.isoformat()} 00:00:00+00'"
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month.year}m{month.month:02d}"
+
+
+def _bound_date(bound: str) -> date:
+    # Bounds are printed in the session time zone, e.g. '2025-05-01 00:00:00+00'
+    return datetime.fromisoformat(bound).astimezone(timezone.utc).date()
+
+
+def _quote(identifier: str) -> str:
+    return db.engine.dialect.identifier_preparer.quote(identifier)
+
+
+def is_partitioned() -> bool:
+    return bool(db.session.scalar(text(
+        "SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :name AND c.relnamespace = current_schema()::regnamespace"
+    ), {"name": PARENT}))
+
+
+def list_partitions() -> List[Tuple[str, Optional[date], Optional[date]]]:
+    """(name, lower, upper) for each range partition; None means unbounded."""
+    rows = db.session.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+        "FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :name AND p.relnamespace = current_schema()::regnamespace "
+        "ORDER BY c.relname"
+    ), {"name": PARENT}).all()
+
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND.search(bound)
+        if not match:
+            continue  # the DEFAULT partition
+        lower, upper = match.group('lower'), match.group('upper')
+        partitions.append((
+            name,
+            _bound_date(lower) if lower else None,
+            _bound_date(upper) if upper else None,
+        ))
+    return partitions
+
+
+def _index_state(connection, name: str) -> Optional[bool]:
+    """True for a valid index, False for one left invalid, None if missing."""
+    return connection.scalar(text(
+        "SELECT i.indisvalid FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND c.relnamespace = current_schema()::regnamespace"
+    ), {"name": name})
+
+
+def _build_index_concurrently(connection, name: str, columns: str,
+                              unique: bool = False) -> None:
+    state = _index_state(connection, name)
+    if state:
+        return
+    if state is False:
+        # Left behind by an interrupted CREATE INDEX CONCURRENTLY
+        connection.execute(text(f"DROP INDEX CONCURRENTLY {name}"))
+    connection.execute(text(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY {name} "
+        f"ON {PARENT} ({columns})"))
+
+
+def convert_to_partitioned(months_ahead: int = 3) -> date:
+    """Turn the plain transactions table into a partitioned one.
+
+    The existing table is attached as-is as the 'legacy' partition covering
+    everything before the first monthly boundary, so no rows are copied.
+    Indexes the parent declares are built on the table beforehand with
+    CREATE INDEX CONCURRENTLY, and the boundary CHECK is validated under a
+    lock that still allows reads and writes. The ACCESS EXCLUSIVE lock is
+    only held for catalog changes: renaming the table, creating the parent
+    and attaching the legacy table, which reuses both the indexes and the
+    validated CHECK. Returns the first monthly boundary.
+    """
+    latest = db.session.scalar(text(f"SELECT max(created_at) FROM {PARENT}"))
+    # The CHECK below applies to inserts made while converting, so the
+    # boundary stays at least a day ahead of the clock
+    soon = (datetime.now(timezone.utc) + timedelta(days=1)).date()
+    if latest:
+        soon = max(soon, latest.astimezone(timezone.utc).date())
+    boundary = _add_months(_month_start(soon), 1)
+    # CREATE INDEX CONCURRENTLY waits for every open transaction, ours included
+    db.session.commit()
+
+    with db.engine.connect() as connection:
+        connection = connection.execution_options(isolation_level='AUTOCOMMIT')
+        # ATTACH adopts an index on the partition when it matches the
+        # parent's definition, instead of building one under the lock
+        _build_index_concurrently(
+            connection, f"{PARENT}_id_created_at_key", "id, created_at", unique=True)
+        for column in ('from_account_id', 'to_account_id'):
+            _build_index_concurrently(
+                connection, f"ix_{PARENT}_{column}_created_at", f"{column}, created_at, id")
+
+    # NOT VALID only takes the lock for a catalog change; VALIDATE scans
+    # the table under SHARE UPDATE EXCLUSIVE, which lets writes through.
+    # A validated CHECK implying the partition bound lets ATTACH skip its scan
+    db.session.execute(text(
+        f"ALTER TABLE {PARENT} DROP CONSTRAINT IF EXISTS {LEGACY}_created_at_range, "
+        f"ADD CONSTRAINT {LEGACY}_created_at_range "
+        f"CHECK (created_at < {_bound_literal(boundary)}) NOT VALID"))
+    db.session.commit()
+    db.session.execute(text(
+        f"ALTER TABLE {PARENT} VALIDATE CONSTRAINT {LEGACY}_created_at_range"))
+    db.session.commit()
+
+    db.session.execute(text(f"LOCK TABLE {PARENT} IN ACCESS EXCLUSIVE MODE"))
+    statements = [
+        f"ALTER TABLE {PARENT} RENAME TO {LEGACY}",
+        f"ALTER TABLE {LEGACY} RENAME CONSTRAINT {PARENT}_pkey TO {LEGACY}_pkey",
+        # The parent's primary key can only adopt an index backing a constraint
+        f"ALTER TABLE {LEGACY} ADD CONSTRAINT {LEGACY}_id_created_at_key "
+        f"UNIQUE USING INDEX {PARENT}_id_created_at_key",
+        f"ALTER INDEX ix_{PARENT}_from_account_id_created_at "
+        f"RENAME TO ix_{LEGACY}_from_account_id_created_at",
+        f"ALTER INDEX ix_{PARENT}_to_account_id_created_at "
+        f"RENAME TO ix_{LEGACY}_to_account_id_created_at",
+        # Defaults (including nextval of the id sequence), NOT NULLs and
+        # CHECKs are copied; keys and indexes are declared on the parent
+        f"CREATE TABLE {PARENT} (LIKE {LEGACY} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE (created_at)",
+        # ...but the boundary CHECK only belongs on the legacy table
+        f"ALTER TABLE {PARENT} DROP CONSTRAINT {LEGACY}_created_at_range",
+        f"ALTER TABLE {PARENT} ADD PRIMARY KEY (id, created_at)",
+        f"ALTER TABLE {PARENT} ADD FOREIGN KEY (from_account_id) REFERENCES accounts (id)",
+        f"ALTER TABLE {PARENT} ADD FOREIGN KEY (to_account_id) REFERENCES accounts (id)",
+        f"CREATE INDEX ix_{PARENT}_from_account_id_created_at "
+        f"ON {PARENT} (from_account_id, created_at, id)",
+        f"CREATE INDEX ix_{PARENT}_to_account_id_created_at "
+        f"ON {PARENT} (to_account_id, created_at, id)",
+        f"ALTER SEQUENCE {PARENT}_id_seq OWNED BY {PARENT}.id",
+        # Adopts the legacy indexes and trusts the CHECK: no scan, no build
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {LEGACY} "
+        f"FOR VALUES FROM (MINVALUE) TO ({_bound_literal(boundary)})",
+        f"ALTER TABLE {LEGACY} DROP CONSTRAINT {LEGACY}_created_at_range",
+        # Safety net so inserts never fail if the create job falls behind
+        f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT} DEFAULT",
+    ]
+    for statement in statements:
+        db.session.execute(text(statement))
+
+    create_partitions(months_ahead, commit=False)
+    db.session.commit()
+    return boundary
+
+
+def _default_partition_rows(lower: date, upper: date) -> bool:
+    if not db.session.scalar(text("SELECT to_regclass(:name)"),
+                             {"name": DEFAULT_PARTITION}):
+        return False
+    return bool(db.session.scalar(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+        f"WHERE created_at >= {_bound_literal(lower)} "
+        f"AND created_at < {_bound_literal(upper)})"
+    )))
+
+
+def _create_partition(month: date) -> str:
+    name = partition_name(month)
+    upper = _add_months(month, 1)
+    bounds = f"FROM ({_bound_literal(month)}) TO ({_bound_literal(upper)})"
+    in_range = (f"created_at >= {_bound_literal(month)} "
+                f"AND created_at < {_bound_literal(upper)}")
+
+    if not _default_partition_rows(month, upper):
+        db.session.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {PARENT} FOR VALUES {bounds}"))
+        return name
+
+    # Rows for this month already landed in the DEFAULT partition, which
+    # makes a plain CREATE ... PARTITION OF fail; move them over instead
+    logger.warning("Moving rows for %s out of %s; run `flask partitions create` "
+                   "more often or with more months ahead", name, DEFAULT_PARTITION)
+    statements = [
+        f"ALTER TABLE {PARENT} DETACH PARTITION {DEFAULT_PARTITION}",
+        f"CREATE TABLE {name} PARTITION OF {PARENT} FOR VALUES {bounds}",
+        f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}",
+        f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}",
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT",
+    ]
+    for statement in statements:
+        db.session.execute(text(statement))
+    return name
+
+
+def create_partitions(months_ahead: int = 3, commit: bool = True) -> List[str]:
+    """Create monthly partitions up to months_ahead months after the current one.
+
+    Rows that already landed in the DEFAULT partition for a new month are
+    moved into it.
+    """
+    partitions = list_partitions()
+    uppers = [upper for _, _, upper in partitions if upper]
+    month = max(uppers) if uppers else _month_start(datetime.now(timezone.utc).date())
+    last = _add_months(_month_start(datetime.now(timezone.utc).date()), months_ahead)
+
+    created = []
+    while month <= last:
+        created.append(_create_partition(month))
+        month = _add_months(month, 1)
+
+    if commit:
+        db.session.commit()
+    return created
+
+
+def detach_partitions(keep_months: int, archive_schema: Optional[str] = None,
+                      drop: bool = False) -> List[str]:
+    """Detach partitions that end before the retention window.
+
+    Detached partitions are moved to archive_schema, dropped, or left as
+    standalone tables. Each partition is handled in its own DB transaction.
+    Run the balance snapshot job first so as-of queries never need the
+    detached rows.
+    """
+    cutoff = _add_months(
+        _month_start(datetime.now(timezone.utc).date()), -keep_months)
+
+    if archive_schema:
+        db.session.execute(text(
+            f"CREATE SCHEMA IF NOT EXISTS {_quote(archive_schema)}"))
+        db.session.commit()
+
+    detached = []
+    for name, _, upper in list_partitions():
+        if upper is None or upper > cutoff:
+            continue
+        db.session.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        if drop:
+            db.session.execute(text(f"DROP TABLE {name}"))
+        elif archive_schema:
+            db.session.execute(text(
+                f"ALTER TABLE {name} SET SCHEMA {_quote(archive_schema)}"))
+        db.session.commit()
+        detached.append(name)
+    return detached
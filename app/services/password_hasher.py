@@ -0,0 +1,102 @@
+"""bcrypt hashing on a bounded process pool.
+
+Hashing is CPU-bound for hundreds of milliseconds, so it runs in a small
+dedicated process pool instead of the request thread. At most
+PASSWORD_HASH_QUEUE_SIZE calls may be running or waiting; beyond that
+HasherBusy is raised and the API answers 503 instead of piling up work.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Optional
+import bcrypt
+from flask import current_app
+from app.utils.response import api_response
+
+# bcrypt only uses the first 72 bytes; longer inputs were always truncated
+MAX_PASSWORD_BYTES = 72
+# Per web worker process: size it as CPU cores / gunicorn workers
+DEFAULT_WORKERS = 2
+
+
+class HasherBusy(Exception):
+    """The hashing queue is full."""
+
+
+def hash_password(password: bytes, rounds: int) -> str:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def check_password(password: bytes, password_hash: bytes) -> bool:
+    return bcrypt.checkpw(password, password_hash)
+
+
+def hash_cost(password_hash: str) -> Optional[int]:
+    """The cost factor of a '$2b$12$...' hash."""
+    try:
+        return int(password_hash.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._pool = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._slots is None:
+                config = current_app.config
+                workers = config.get('PASSWORD_HASH_WORKERS', DEFAULT_WORKERS)
+                self._slots = threading.BoundedSemaphore(
+                    config.get('PASSWORD_HASH_QUEUE_SIZE', 16))
+                # Without workers hashing runs inline, e.g. for local runs
+                if workers:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=workers, mp_context=get_context('spawn'))
+        return self._pool, self._slots
+
+    def _run(self, function, *args):
+        pool, slots = self._start()
+        if not slots.acquire(blocking=False):
+            raise HasherBusy()
+        try:
+            if pool is None:
+                return function(*args)
+            return pool.submit(function, *args).result()
+        finally:
+            slots.release()
+
+    def hash(self, password: str) -> str:
+        return self._run(hash_password, password.encode('utf-8')[:MAX_PASSWORD_BYTES],
+                         current_app.config.get('BCRYPT_LOG_ROUNDS', 12))
+
+    def check(self, password_hash: str, password: str) -> bool:
+        return self._run(check_password, password.encode('utf-8')[:MAX_PASSWORD_BYTES],
+                         password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return hash_cost(password_hash) != current_app.config.get('BCRYPT_LOG_ROUNDS', 12)
+
+
+hasher = PasswordHasher()
+# A forked server worker starts its own pool
+os.register_at_fork(after_in_child=hasher.reset)
+
+
+def init_password_hasher(app) -> None:
+    @app.errorhandler(HasherBusy)
+    def hasher_busy(error):
+        response, status_code = api_response(
+            "Service busy",
+            503,
+            errors={"message": "Too many password operations in progress, please retry shortly"}
+        )
+        response.headers['Retry-After'] = '1'
+        return response, status_code
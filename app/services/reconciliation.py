@@ -0,0 +1,147 @@
+"""Check account balances against the postings ledger.
+
+Accounts are split into id ranges that a process pool checks side by side.
+Each range is a single read-only SELECT, so it sees the balances and the
+postings in one consistent snapshot and takes no locks that would block
+writers.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal
+from multiprocessing import get_context
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import case, create_engine, exists, func, insert, literal, not_, select, union_all
+from app.models.account import Account
+from app.models.account_balance_slot import AccountBalanceSlot
+from app.models.posting import Posting, PostingDirection
+from app.models.transaction import Transaction
+from app import db
+
+_engine = None
+
+
+@dataclass
+class Drift:
+    account_id: int
+    balance: Decimal
+    posted: Decimal
+
+    @property
+    def difference(self) -> Decimal:
+        return self.balance - self.posted
+
+
+def _init_worker(url: str) -> None:
+    global _engine
+    _engine = create_engine(url, pool_size=1)
+
+
+def _check_range(bounds: Tuple[int, int]) -> List[Drift]:
+    low, high = bounds
+    signed_amount = case(
+        (Posting.direction == PostingDirection.CREDIT, Posting.amount),
+        else_=-Posting.amount
+    )
+    posted = (
+        select(Posting.account_id, func.sum(signed_amount).label('total'))
+        .where(Posting.account_id.between(low, high))
+        .group_by(Posting.account_id)
+        .subquery()
+    )
+    parked = (
+        select(AccountBalanceSlot.account_id,
+               func.sum(AccountBalanceSlot.balance).label('total'))
+        .where(AccountBalanceSlot.account_id.between(low, high))
+        .group_by(AccountBalanceSlot.account_id)
+        .subquery()
+    )
+    balance = Account.balance + func.coalesce(parked.c.total, 0)
+    expected = func.coalesce(posted.c.total, 0)
+
+    stmt = (
+        select(Account.id, balance, expected)
+        .outerjoin(posted, posted.c.account_id == Account.id)
+        .outerjoin(parked, parked.c.account_id == Account.id)
+        .where(Account.id.between(low, high),
+               Account.deleted_at.is_(None),
+               balance != expected)
+        .order_by(Account.id)
+    )
+    with _engine.connect() as connection:
+        return [Drift(*row) for row in connection.execute(stmt)]
+
+
+def _ranges(first: int, last: int, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    for low in range(first, last + 1, chunk_size):
+        yield low, min(low + chunk_size - 1, last)
+
+
+def reconcile(workers: int = 4, chunk_size: int = 10000) -> Tuple[int, List[Drift]]:
+    """Recompute every balance from postings; returns (accounts, drifts).
+
+    Deleted accounts are skipped since their history may be purged.
+    """
+    first, last, count = db.session.execute(
+        select(func.min(Account.id), func.max(Account.id), func.count(Account.id))
+        .where(Account.deleted_at.is_(None))
+    ).one()
+    db.session.rollback()
+    if not count:
+        return 0, []
+
+    url = db.engine.url.render_as_string(hide_password=False)
+    # spawn: workers open their own connections instead of inheriting ours
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                             initializer=_init_worker, initargs=(url,)) as pool:
+        drifts = [
+            drift
+            for chunk in pool.map(_check_range, _ranges(first, last, chunk_size))
+            for drift in chunk
+        ]
+    return count, drifts
+
+
+def backfill_postings(chunk_size: int = 50000) -> int:
+    """Write postings for transactions recorded before postings existed.
+
+    Works through the transactions in id ranges, one DB transaction each.
+    """
+    last: Optional[int] = db.session.scalar(select(func.max(Transaction.id)))
+    if last is None:
+        return 0
+
+    written = 0
+    for low, high in _ranges(1, last, chunk_size):
+        missing = (
+            select(Transaction)
+            .where(
+                Transaction.id.between(low, high),
+                not_(exists().where(Posting.transaction_id == Transaction.id))
+            )
+            .subquery()
+        )
+        direction_type = Posting.__table__.c.direction.type
+        # Both sides in one statement, so the NOT EXISTS above is evaluated
+        # before either side is written
+        sides = union_all(*(
+            select(
+                missing.c.id,
+                account_id,
+                literal(direction, direction_type),
+                missing.c.amount,
+                missing.c.created_at
+            )
+            for account_id, direction in (
+                (missing.c.from_account_id, PostingDirection.DEBIT),
+                (missing.c.to_account_id, PostingDirection.CREDIT))
+        ))
+        result = db.session.execute(
+            insert(Posting).from_select(
+                ['transaction_id', 'account_id', 'direction',
+                 'amount', 'created_at'],
+                sides
+            )
+        )
+        written += result.rowcount
+        db.session.commit()
+    return written
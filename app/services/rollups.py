@@ -0,0 +1,137 @@
+from collections import defaultdict
+from datetime import date, timezone
+from decimal import Decimal
+from typing import Iterable, List, Optional
+from sqlalchemy import Date, case, cast, delete, func, literal, select, union_all, insert as sql_insert
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.transaction import Transaction, TransactionType
+from app.models.transaction_rollup import TransactionRollup, RollupCategory
+from app import db
+
+CATEGORY_TYPE = TransactionRollup.__table__.c.category.type
+_UPSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+def _month(created_at) -> date:
+    return created_at.astimezone(timezone.utc).date().replace(day=1)
+
+
+def _categories(transaction: Transaction):
+    """Yield (account_id, category) pairs a transaction contributes to."""
+    if transaction.type == TransactionType.DEPOSIT:
+        yield transaction.to_account_id, RollupCategory.DEPOSIT
+    elif transaction.type == TransactionType.WITHDRAWAL:
+        yield transaction.from_account_id, RollupCategory.WITHDRAWAL
+    else:
+        yield transaction.from_account_id, RollupCategory.TRANSFER_OUT
+        yield transaction.to_account_id, RollupCategory.TRANSFER_IN
+
+
+def apply_rollups(transactions: Iterable[Transaction]) -> None:
+    """Fold newly written transactions into the monthly rollups.
+
+    Runs in the caller's DB transaction as a single multi-row upsert, so the
+    rollups commit (or roll back) together with the transactions.
+    """
+    buckets = defaultdict(lambda: [0, Decimal(0)])
+    for transaction in transactions:
+        month = _month(transaction.created_at)
+        for account_id, category in _categories(transaction):
+            bucket = buckets[(account_id, month, category)]
+            bucket[0] += 1
+            bucket[1] += transaction.amount
+
+    if not buckets:
+        return
+
+    insert = _UPSERTS[db.session.get_bind().dialect.name]
+    stmt = insert(TransactionRollup).values([
+        {
+            "account_id": account_id,
+            "month": month,
+            "category": category,
+            "count": count,
+            "total": total
+        }
+        # Sorted so concurrent writers lock rollup rows in the same order
+        for (account_id, month, category), (count, total) in sorted(buckets.items())
+    ])
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=['account_id', 'month', 'category'],
+        set_={
+            "count": TransactionRollup.count + stmt.excluded.count,
+            "total": TransactionRollup.total + stmt.excluded.total
+        }
+    ))
+
+
+def summarize(account_ids, start: Optional[date] = None, end: Optional[date] = None) -> List[TransactionRollup]:
+    """Monthly rollups for the given accounts, newest month first."""
+    query = TransactionRollup.query.filter(
+        TransactionRollup.account_id.in_(account_ids))
+    if start:
+        query = query.filter(TransactionRollup.month >= start.replace(day=1))
+    if end:
+        query = query.filter(TransactionRollup.month <= end.replace(day=1))
+    return query.order_by(
+        TransactionRollup.month.desc(),
+        TransactionRollup.account_id,
+        TransactionRollup.category
+    ).all()
+
+
+def rebuild_rollups() -> int:
+    """Recompute every rollup from the transactions table with GROUP BY.
+
+    Used to backfill history; run it while transaction writes are paused,
+    otherwise rows written during the rebuild may be counted twice.
+    """
+    month = cast(
+        func.date_trunc('month', func.timezone('UTC', Transaction.created_at)),
+        Date
+    )
+
+    # Explicit casts keep UNION ALL from resolving the labels to text
+    def category(transaction_type, when_matches, otherwise):
+        return case(
+            (Transaction.type == transaction_type,
+             cast(literal(when_matches, CATEGORY_TYPE), CATEGORY_TYPE)),
+            else_=cast(literal(otherwise, CATEGORY_TYPE), CATEGORY_TYPE)
+        )
+
+    movements = union_all(
+        select(
+            Transaction.to_account_id.label('account_id'),
+            month.label('month'),
+            category(TransactionType.DEPOSIT, RollupCategory.DEPOSIT,
+                     RollupCategory.TRANSFER_IN).label('category'),
+            Transaction.amount.label('amount')
+        ).where(Transaction.to_account_id.is_not(None)),
+        select(
+            Transaction.from_account_id.label('account_id'),
+            month.label('month'),
+            category(TransactionType.WITHDRAWAL, RollupCategory.WITHDRAWAL,
+                     RollupCategory.TRANSFER_OUT).label('category'),
+            Transaction.amount.label('amount')
+        ).where(Transaction.from_account_id.is_not(None)),
+    ).subquery()
+
+    db.session.execute(delete(TransactionRollup))
+    result = db.session.execute(
+        sql_insert(TransactionRollup).from_select(
+            ['account_id', 'month', 'category', 'count', 'total'],
+            select(
+                movements.c.account_id,
+                movements.c.month,
+                movements.c.category,
+                func.count(),
+                func.sum(movements.c.amount)
+            ).group_by(
+                movements.c.account_id,
+                movements.c.month,
+                movements.c.category
+            )
+        )
+    )
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,116 @@
+import logging
+import threading
+from typing import List
+from sqlalchemy import select
+from app.models.account import Account
+from app.models.transaction import TransactionType
+from app.models.transfer_intent import TransferIntent, TransferIntentStatus
+from app.services import ledger
+from app import db
+
+logger = logging.getLogger(__name__)
+
+INTENT_ERRORS = {
+    ledger.INSUFFICIENT_FUNDS: "Your account balance is insufficient for this transfer",
+    ledger.ACCOUNT_NOT_FOUND: "The recipient account does not exist",
+}
+# The source account was closed or purged after the intent was accepted
+SOURCE_NOT_FOUND = "The specified account does not exist or you don't have access to it"
+
+
+def _apply_intent(intent: TransferIntent) -> None:
+    savepoint = db.session.begin_nested()
+    from_account, to_account, error = ledger.transfer(
+        intent.from_account_id, intent.to_account_id, intent.amount)
+
+    if error:
+        savepoint.rollback()
+        intent.status = TransferIntentStatus.FAILED
+        intent.error = INTENT_ERRORS[error]
+        return
+
+    transaction, = ledger.record_transactions([{
+        "from_account_id": from_account.id,
+        "to_account_id": to_account.id,
+        "amount": intent.amount,
+        "type": TransactionType.TRANSFER,
+        "description": intent.description
+    }])
+    savepoint.commit()
+    intent.status = TransferIntentStatus.COMPLETED
+    intent.transaction_id = transaction.id
+
+
+def process_batch(batch_size: int = 100) -> int:
+    """Claim and apply up to batch_size pending intents in one DB transaction.
+
+    SKIP LOCKED lets any number of workers drain the queue side by side.
+    Every account the batch touches is locked up front in id order, the
+    same order single transfers use, so workers never deadlock each other
+    or the web requests. Intents whose source account is gone or no longer
+    belongs to the requester fail before anything is debited.
+    """
+    intents: List[TransferIntent] = (
+        TransferIntent.query
+        .filter_by(status=TransferIntentStatus.PENDING)
+        .order_by(TransferIntent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not intents:
+        db.session.rollback()
+        return 0
+
+    account_ids = sorted({
+        account_id
+        for intent in intents
+        for account_id in (intent.from_account_id, intent.to_account_id)
+    })
+    owners = dict(db.session.execute(
+        select(Account.id, Account.user_id)
+        .where(Account.id.in_(account_ids), Account.deleted_at.is_(None))
+        .order_by(Account.id)
+        .with_for_update()
+    ).all())
+
+    for intent in intents:
+        if owners.get(intent.from_account_id) != intent.user_id:
+            # Without this, the failed debit would read as insufficient funds
+            intent.status = TransferIntentStatus.FAILED
+            intent.error = SOURCE_NOT_FOUND
+            continue
+        if intent.from_account_id == intent.to_account_id:
+            intent.status = TransferIntentStatus.FAILED
+            intent.error = "Cannot transfer to the same account"
+            continue
+        _apply_intent(intent)
+
+    db.session.commit()
+    return len(intents)
+
+
+def run_workers(app, workers: int, batch_size: int, poll_interval: float,
+                stop: threading.Event) -> None:
+    """Run a pool of worker threads until stop is set."""
+
+    def work():
+        with app.app_context():
+            while not stop.is_set():
+                try:
+                    processed = process_batch(batch_size)
+                except Exception:
+                    db.session.rollback()
+                    logger.exception("Transfer batch failed")
+                    processed = 0
+                if not processed:
+                    stop.wait(poll_interval)
+
+    threads = [
+        threading.Thread(target=work, name=f"transfer-worker-{index}", daemon=True)
+        for index in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
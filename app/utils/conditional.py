@@ -0,0 +1,35 @@
+import hashlib
+from typing import Optional
+from flask import Response, request
+
+# Responses depend on the bearer token, so only the client may store them
+REVALIDATE = "private, no-cache"
+IMMUTABLE = "private, max-age=31536000, immutable"
+
+
+def make_etag(*parts) -> str:
+    """Strong validator derived from the given version parts."""
+    raw = '|'.join(str(part) for part in parts).encode('utf-8')
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+
+def _set_validators(response: Response, etag: str, cache_control: str) -> None:
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    response.vary.add('Authorization')
+
+
+def not_modified(etag: str, cache_control: str) -> Optional[Response]:
+    """An empty 304 if the client already holds this version, else None."""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = Response(status=304)
+    _set_validators(response, etag, cache_control)
+    return response
+
+
+def cacheable(result, etag: str, cache_control: str):
+    """Attach the validators to an api_response result."""
+    response, status_code = result
+    _set_validators(response, etag, cache_control)
+    return response, status_code
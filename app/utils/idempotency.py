@@ -0,0 +1,118 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from flask import current_app
+from sqlalchemy import delete, select
+from app.models.idempotency_key import IdempotencyKey
+from app.utils.cache import LRUCache
+from app.utils.response import api_response
+from app import db
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+_cache: Optional[LRUCache] = None
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    body: str
+    location: Optional[str] = None
+
+
+def _get_cache() -> LRUCache:
+    global _cache
+    if _cache is None:
+        _cache = LRUCache(current_app.config.get(
+            'IDEMPOTENCY_CACHE_SIZE', 1024))
+    return _cache
+
+
+def request_fingerprint(data) -> str:
+    """Hash of the request payload, used to detect reuse of a key."""
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def lookup(user_id, key: str) -> Optional[StoredResponse]:
+    """Find the stored response for a key, checking the in-process LRU first."""
+    cache_key = (str(user_id), key)
+    stored = _get_cache().get(cache_key)
+    if stored:
+        return stored
+
+    row = IdempotencyKey.query.filter_by(user_id=user_id, key=key).first()
+    if not row:
+        return None
+
+    stored = StoredResponse(row.request_hash, row.status_code,
+                            row.response_body, row.response_location)
+    _get_cache().set(cache_key, stored)
+    return stored
+
+
+def save(user_id, key: str, request_hash: str, response, status_code: int) -> StoredResponse:
+    """Stage the response in the current DB transaction.
+
+    The caller commits it together with the transaction it describes and
+    then passes the result to remember().
+    """
+    stored = StoredResponse(request_hash, status_code,
+                            response.get_data(as_text=True),
+                            response.headers.get('Location'))
+    db.session.add(IdempotencyKey(
+        user_id=user_id,
+        key=key,
+        request_hash=request_hash,
+        status_code=status_code,
+        response_body=stored.body,
+        response_location=stored.location
+    ))
+    return stored
+
+
+def remember(user_id, key: str, stored: StoredResponse) -> None:
+    _get_cache().set((str(user_id), key), stored)
+
+
+def replay(stored: StoredResponse, request_hash: str):
+    """Return the original response, or 422 if the payload changed."""
+    if stored.request_hash != request_hash:
+        return api_response(
+            "Idempotency key reuse",
+            422,
+            errors={
+                "message": "This Idempotency-Key was already used with a different request body"}
+        )
+
+    response = current_app.response_class(
+        stored.body,
+        status=stored.status_code,
+        mimetype='application/json'
+    )
+    if stored.location:
+        response.headers['Location'] = stored.location
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def purge_expired(retention: timedelta, chunk_size: int = 1000) -> int:
+    """Delete keys older than retention, one short DB transaction per chunk.
+
+    A retry arriving after that is treated as a new request.
+    """
+    cutoff = datetime.now(timezone.utc) - retention
+    purged = 0
+    while True:
+        chunk = select(IdempotencyKey.id).where(
+            IdempotencyKey.created_at < cutoff).limit(chunk_size)
+        result = db.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.id.in_(chunk)))
+        db.session.commit()
+        purged += result.rowcount
+        if result.rowcount < chunk_size:
+            return purged
@@ -0,0 +1,61 @@
+"""JSON responses through orjson when it is installed.
+
+Output matches Flask's default provider byte for byte: sorted keys, compact
+separators, ASCII-only text and a trailing newline. The one difference is
+dates and datetimes, which are written in ISO 8601 as orjson does natively
+(the same text as isoformat()) rather than in HTTP date format. Decimal goes
+through Flask's default() as str(value). orjson writes non-ASCII characters,
+control character escapes and float exponents differently, so any payload
+containing them is re-encoded with the standard library. Debug mode, where
+responses are indented, and dumps() always use the standard library.
+
+Objects may define __json__() returning a JSON-ready value, so views can
+pass models instead of building the list of dicts themselves. Models return
+their raw datetimes and enums there and leave the formatting to the encoder.
+"""
+import re
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+_FLOAT_EXPONENT = re.compile(rb'\de[-+]?\d')
+
+
+def _default(obj):
+    if hasattr(obj, '__json__'):
+        return obj.__json__()
+    if isinstance(obj, date):
+        return obj.isoformat()  # as orjson writes them
+    return DefaultJSONProvider.default(obj)
+
+
+def _dumps_fast(obj):
+    """orjson bytes, or None when the result could differ from the stdlib."""
+    try:
+        output = orjson.dumps(obj, default=_default, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        return None  # non-str keys, integers over 64 bits, ...
+    if not output.isascii() or b'\\u' in output or b'\x7f' in output \
+            or _FLOAT_EXPONENT.search(output):
+        return None
+    return output
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+
+    def response(self, *args, **kwargs):
+        # Indented debug output keeps the standard encoder
+        if orjson is None or self.compact is False or (
+                self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        output = _dumps_fast(obj)
+        if output is None:
+            output = self.dumps(obj, separators=(",", ":")).encode('ascii')
+        return self._app.response_class(output + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,25 @@
+from typing import FrozenSet
+from flask import g
+from sqlalchemy import select
+from app.models.account import Account
+from app import db
+
+
+def owned_account_ids_select(user_id):
+    """SELECT of the user's account ids, for use inside IN (...) clauses."""
+    return select(Account.id).where(
+        Account.user_id == user_id, Account.deleted_at.is_(None))
+
+
+def user_account_ids(user_id) -> FrozenSet[int]:
+    """The user's account ids, loaded once per request.
+
+    Only the id column is fetched, and the result is memoized on flask.g
+    so repeated ownership checks within a request are free.
+    """
+    memo = g.setdefault('_user_account_ids', {})
+    key = str(user_id)
+    if key not in memo:
+        memo[key] = frozenset(
+            db.session.scalars(owned_account_ids_select(user_id)))
+    return memo[key]
@@ -0,0 +1,81 @@
+"""Connection pool statistics, per process and per engine."""
+import threading
+from time import perf_counter
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.util import queue as sqla_queue
+
+
+class _WaitTimingQueue(sqla_queue.Queue):
+    """Pool queue that tallies the time each thread spends waiting in get()."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waits = threading.local()
+
+    def get(self, block=True, timeout=None):
+        started = perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            self.waits.seconds = getattr(self.waits, 'seconds', 0.0) + \
+                perf_counter() - started
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait and how often they time out.
+
+    Only the wait for a free pooled connection is counted, not opening new
+    connections or the pre-ping, so the numbers reflect pool contention.
+    """
+
+    _queue_class = _WaitTimingQueue
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self):
+        self._pool.waits.seconds = 0.0
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = self._pool.waits.seconds
+            with self._stats_lock:
+                self.checkouts += 1
+                self.timeouts += timed_out
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        with pool._stats_lock:
+            stats.update(
+                checkouts=pool.checkouts,
+                timeouts=pool.timeouts,
+                wait_ms_avg=round(
+                    pool.wait_seconds_total / pool.checkouts * 1000, 3)
+                if pool.checkouts else 0.0,
+                wait_ms_max=round(pool.wait_seconds_max * 1000, 3),
+            )
+    return stats
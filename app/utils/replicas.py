@@ -0,0 +1,160 @@
+"""Route reads of replica-safe endpoints to read replicas.
+
+Replicas are configured as SQLALCHEMY_BINDS named replica0, replica1, ...
+A request goes to a replica only if its view is marked with
+@replica_reads, the client has not written within READ_YOUR_WRITES_SECONDS,
+and a replica is lagging by at most REPLICA_MAX_LAG_SECONDS. Everything
+else, including every write and SELECT ... FOR UPDATE, uses the primary.
+
+Responses to writes carry the write time in the last_write cookie and the
+X-Last-Write header, so the client's next read reaches the primary whichever
+worker process serves it. Clients that keep neither are still covered when
+their read lands on the worker that took the write.
+"""
+import logging
+import math
+import random
+import time
+from typing import Optional
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.sql.dml import UpdateBase
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+REPLICA_PREFIX = 'replica'
+LAST_WRITE_COOKIE = 'last_write'
+LAST_WRITE_HEADER = 'X-Last-Write'
+
+_recent_writes = LRUCache(100000)
+_replica_lag = LRUCache(64)
+
+
+def replica_bind_keys(urls) -> dict:
+    return {f"{REPLICA_PREFIX}{index}": url for index, url in enumerate(urls)}
+
+
+def replica_reads(view):
+    """Mark a view as safe to serve from a read replica."""
+    view.replica_reads = True
+    return view
+
+
+def _current_user() -> Optional[str]:
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        return None  # no JWT was verified for this request
+
+
+def _lag(key: str) -> float:
+    """Replication lag in seconds, re-measured at most once per interval."""
+    checked = _replica_lag.get(key)
+    interval = current_app.config.get('REPLICA_LAG_CHECK_INTERVAL', 1.0)
+    if checked and time.monotonic() - checked[1] < interval:
+        return checked[0]
+
+    engine = current_app.extensions['sqlalchemy'].engines[key]
+    try:
+        with engine.connect() as connection:
+            if engine.dialect.name == 'postgresql':
+                # Caught up replicas report 0 even when the primary is idle
+                lag = connection.scalar(text(
+                    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+                    "THEN 0 ELSE COALESCE(EXTRACT(EPOCH FROM "
+                    "now() - pg_last_xact_replay_timestamp()), 0) END"))
+            else:
+                connection.execute(text("SELECT 1"))
+                lag = 0
+        lag = float(lag)
+    except Exception:
+        logger.warning("Replica %s is unavailable", key, exc_info=True)
+        lag = float('inf')
+
+    _replica_lag.set(key, (lag, time.monotonic()))
+    return lag
+
+
+def _last_write() -> Optional[float]:
+    """Epoch time of the client's latest write, as far as this worker knows."""
+    times = []
+    value = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    try:
+        # A time in the future would pin the client to the primary for good
+        times.append(min(float(value), time.time()))
+    except (TypeError, ValueError):
+        pass  # no write reported by the client
+
+    user_id = _current_user()
+    local = _recent_writes.get(str(user_id)) if user_id is not None else None
+    if local:
+        times.append(local)
+    return max(times, default=None)
+
+
+def _choose_replica() -> Optional[str]:
+    keys = [key for key in current_app.extensions['sqlalchemy'].engines
+            if key and key.startswith(REPLICA_PREFIX)]
+    if not keys:
+        return None
+
+    # Read your own writes: stay on the primary for a while after a write
+    wrote_at = _last_write()
+    window = current_app.config.get('READ_YOUR_WRITES_SECONDS', 5)
+    if wrote_at and time.time() - wrote_at < window:
+        return None
+
+    max_lag = current_app.config.get('REPLICA_MAX_LAG_SECONDS', 2)
+    healthy = [key for key in keys if _lag(key) <= max_lag]
+    return random.choice(healthy) if healthy else None
+
+
+def _replica_key() -> Optional[str]:
+    if not has_request_context() or not g.get('_replica_reads'):
+        return None
+    # Chosen once per request so all its reads see the same snapshot
+    if '_replica_key' not in g:
+        g._replica_key = _choose_replica()
+    return g._replica_key
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not (
+                isinstance(clause, UpdateBase)
+                or getattr(clause, '_for_update_arg', None) is not None):
+            key = _replica_key()
+            if key:
+                return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _note_commit(session):
+    if has_request_context():
+        g._db_committed = True
+
+
+def init_replica_routing(app) -> None:
+    @app.before_request
+    def route_reads():
+        view = app.view_functions.get(request.endpoint)
+        g._replica_reads = request.method in ('GET', 'HEAD') and \
+            getattr(view, 'replica_reads', False)
+
+    @app.after_request
+    def remember_writes(response):
+        if g.get('_db_committed'):
+            wrote_at = time.time()
+            response.headers[LAST_WRITE_HEADER] = f"{wrote_at:.3f}"
+            response.set_cookie(
+                LAST_WRITE_COOKIE, f"{wrote_at:.3f}",
+                max_age=math.ceil(app.config.get('READ_YOUR_WRITES_SECONDS', 5)),
+                httponly=True, samesite='Lax')
+            user_id = _current_user()
+            if user_id is not None:
+                _recent_writes.set(str(user_id), wrote_at)
+        return response
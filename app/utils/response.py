@@ -6,7 +6,8 @@ def api_response(
     message: str,
     status_code: int,
     data: Optional[Dict[str, Any]] = None,
-    errors: Optional[Dict[str, Any]] = None
+    errors: Optional[Dict[str, Any]] = None,
+    meta: Optional[Dict[str, Any]] = None
 ):
     response = {
         "message": message,
@@ -17,5 +18,7 @@ def api_response(
         response["data"] = data
     if errors is not None:
         response["errors"] = errors
+    if meta is not None:
+        response["meta"] = meta
 
     return jsonify(response), status_code
@@ -0,0 +1,120 @@
+"""Revoked JWTs, checked on every request without a database query.
+
+Each process keeps the revoked jtis, with their expiry, in memory. At most
+once per TOKEN_REVOCATION_SYNC_INTERVAL seconds it fetches the rows revoked
+since its last sync, going back an extra SYNC_OVERLAP to catch rows that
+committed late, and drops entries that have expired. Every
+TOKEN_REVOCATION_RELOAD_INTERVAL seconds it re-reads all unexpired rows
+instead, as a backstop for rows that committed even later. Tokens revoked
+in this process are added immediately. A token revoked elsewhere is
+therefore rejected within one sync interval.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+from flask import current_app
+from sqlalchemy import delete, insert, select
+from app.models.revoked_token import RevokedToken
+from app.utils.response import api_response
+from app import db
+
+# revoked_at is set before commit, so a row can become visible after rows
+# with a later revoked_at; look back this far on every incremental sync
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+def _aware(moment: datetime) -> datetime:
+    # sqlite returns naive datetimes; they are stored in UTC
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+class RevocationStore:
+    def __init__(self):
+        self._jtis: Dict[str, float] = {}  # jti -> expiry, epoch seconds
+        self._seen_until = None  # latest revoked_at loaded
+        self._synced_at = float('-inf')
+        self._reloaded_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def _fetch(self, since=None) -> None:
+        stmt = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at) \
+            .where(RevokedToken.expires_at > datetime.now(timezone.utc))
+        if since is not None:
+            stmt = stmt.where(RevokedToken.revoked_at > since - SYNC_OVERLAP)
+        # Own connection so the check never joins the request's transaction
+        with db.engine.connect() as connection:
+            rows = connection.execute(stmt).all()
+
+        for jti, expires_at, revoked_at in rows:
+            self._jtis[jti] = _aware(expires_at).timestamp()
+            revoked_at = _aware(revoked_at)
+            if self._seen_until is None or revoked_at > self._seen_until:
+                self._seen_until = revoked_at
+
+    def _sync(self) -> None:
+        config = current_app.config
+        interval = config.get('TOKEN_REVOCATION_SYNC_INTERVAL', 5)
+        if time.monotonic() - self._synced_at < interval:
+            return
+        with self._lock:
+            if time.monotonic() - self._synced_at < interval:
+                return
+            # Revocations are permanent, so a reload only adds what the
+            # incremental syncs missed
+            if time.monotonic() - self._reloaded_at >= config.get(
+                    'TOKEN_REVOCATION_RELOAD_INTERVAL', 300):
+                self._fetch()
+                self._reloaded_at = time.monotonic()
+            else:
+                self._fetch(self._seen_until)
+
+            now = time.time()
+            self._jtis = {jti: expires for jti, expires in self._jtis.items()
+                          if expires > now}
+            self._synced_at = time.monotonic()
+
+    def is_revoked(self, jti: str) -> bool:
+        self._sync()
+        return jti in self._jtis
+
+    def save(self, token: dict) -> None:
+        """Persist a decoded token's revocation; the caller commits."""
+        db.session.execute(insert(RevokedToken).values(
+            jti=token['jti'],
+            token_type=token['type'],
+            user_id=int(token['sub']),
+            expires_at=datetime.fromtimestamp(token['exp'], timezone.utc)
+        ))
+
+    def remember(self, token: dict) -> None:
+        """Reject a decoded token in this process right away, after commit."""
+        # Under the lock so a sync replacing the dict cannot drop it
+        with self._lock:
+            self._jtis[token['jti']] = float(token['exp'])
+
+
+store = RevocationStore()
+
+
+def prune_expired() -> int:
+    """Delete revocations of tokens that have expired anyway."""
+    result = db.session.execute(
+        delete(RevokedToken)
+        .where(RevokedToken.expires_at <= datetime.now(timezone.utc)))
+    db.session.commit()
+    return result.rowcount
+
+
+def init_revocation(jwt) -> None:
+    @jwt.token_in_blocklist_loader
+    def token_revoked(jwt_header, jwt_payload) -> bool:
+        return store.is_revoked(jwt_payload['jti'])
+
+    @jwt.revoked_token_loader
+    def revoked_response(jwt_header, jwt_payload):
+        return api_response(
+            "Token has been revoked",
+            401,
+            errors={"message": "Please log in again"}
+        )
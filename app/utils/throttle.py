@@ -0,0 +1,110 @@
+"""Token-bucket throttling of login attempts.
+
+Every attempt takes a token from the bucket of the username and of the
+client IP; a successful login refills the username bucket. When a bucket
+is empty the attempt is rejected before any user lookup or bcrypt work.
+Buckets live in process memory by default, or in the login_throttles
+table (LOGIN_THROTTLE_STORE=database) to share them between workers.
+"""
+import threading
+import time
+from typing import Optional
+from flask import current_app, request
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.login_throttle import LoginThrottle
+from app.utils.cache import LRUCache
+from app import db
+
+
+class MemoryBucketStore:
+    def __init__(self, maxsize: int):
+        self._buckets = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, now: float) -> float:
+        """Take a token; returns 0 or the seconds until one is available."""
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            if tokens < 1:
+                self._buckets.set(key, (tokens, now))
+                return (1 - tokens) / rate
+            self._buckets.set(key, (tokens - 1, now))
+            return 0
+
+    def reset(self, key: str) -> None:
+        self._buckets.delete(key)
+
+
+class DatabaseBucketStore:
+    _inserts = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+    def take(self, key: str, capacity: float, rate: float, now: float) -> float:
+        table = LoginThrottle.__table__
+        refilled = func.min(capacity, table.c.tokens + (now - table.c.updated_at) * rate) \
+            if db.engine.dialect.name == 'sqlite' else \
+            func.least(capacity, table.c.tokens + (now - table.c.updated_at) * rate)
+
+        insert = self._inserts[db.engine.dialect.name](table).values(
+            key=key, tokens=capacity - 1, updated_at=now)
+        # One atomic upsert: refill, then take a token only if one is left
+        stmt = insert.on_conflict_do_update(
+            index_elements=['key'],
+            set_={"tokens": refilled - 1, "updated_at": now},
+            where=refilled >= 1
+        ).returning(table.c.tokens)
+
+        # Own short transaction, independent of the request's session
+        with db.engine.begin() as connection:
+            if connection.execute(stmt).first():
+                return 0
+            tokens, updated_at = connection.execute(
+                select(table.c.tokens, table.c.updated_at)
+                .where(table.c.key == key)
+            ).one()
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+        return max((1 - tokens) / rate, 0.001)
+
+    def reset(self, key: str) -> None:
+        with db.engine.begin() as connection:
+            connection.execute(delete(LoginThrottle).where(LoginThrottle.key == key))
+
+
+_store = None
+
+
+def _get_store():
+    global _store
+    if _store is None:
+        if current_app.config.get('LOGIN_THROTTLE_STORE', 'memory') == 'database':
+            _store = DatabaseBucketStore()
+        else:
+            _store = MemoryBucketStore(
+                current_app.config.get('LOGIN_THROTTLE_CACHE_SIZE', 100000))
+    return _store
+
+
+def _username_key(username: str) -> str:
+    return f"user:{username.lower()}"
+
+
+def check_login(username: str) -> Optional[float]:
+    """Seconds the client must wait, or None if the attempt may proceed."""
+    config = current_app.config
+    window = config.get('LOGIN_THROTTLE_WINDOW', 60)
+    limits = (
+        (f"ip:{request.remote_addr}", config.get('LOGIN_IP_LIMIT', 20)),
+        (_username_key(username), config.get('LOGIN_USER_LIMIT', 5)),
+    )
+
+    store, now = _get_store(), time.time()
+    for key, limit in limits:
+        retry_after = store.take(key, limit, limit / window, now)
+        if retry_after:
+            return retry_after
+    return None
+
+
+def login_succeeded(username: str) -> None:
+    _get_store().reset(_username_key(username))
@@ -0,0 +1,88 @@
+"""Per-process cache of user records for JWT-authenticated requests.
+
+Entries are plain snapshots rather than ORM objects, so they can be shared
+between requests and threads. Each process invalidates its own entry when
+a user is changed; other processes see the change once USER_CACHE_TTL
+runs out.
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from flask import current_app
+from sqlalchemy import select
+from app.models.user import User
+from app.utils.cache import LRUCache
+from app.utils.response import api_response
+from app import db
+
+_cache: Optional[LRUCache] = None
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    id: int
+    username: str
+    email: str
+    created_at: datetime
+    updated_at: datetime
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'username': self.username,
+            'email': self.email,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
+
+
+def _get_cache() -> LRUCache:
+    global _cache
+    if _cache is None:
+        _cache = LRUCache(current_app.config.get('USER_CACHE_SIZE', 10000))
+    return _cache
+
+
+def get_user(user_id) -> Optional[CachedUser]:
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    cache = _get_cache()
+    entry = cache.get(user_id)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+
+    row = db.session.execute(
+        select(User.id, User.username, User.email,
+               User.created_at, User.updated_at)
+        .where(User.id == user_id)
+    ).first()
+    if not row:
+        cache.delete(user_id)
+        return None
+
+    user = CachedUser(*row)
+    cache.set(user_id, (
+        time.monotonic() + current_app.config.get('USER_CACHE_TTL', 60), user))
+    return user
+
+
+def invalidate(user_id) -> None:
+    _get_cache().delete(int(user_id))
+
+
+def init_user_cache(jwt) -> None:
+    @jwt.user_lookup_loader
+    def load_user(jwt_header, jwt_data) -> Optional[CachedUser]:
+        return get_user(jwt_data['sub'])
+
+    @jwt.user_lookup_error_loader
+    def user_not_found(jwt_header, jwt_data):
+        return api_response(
+            "User not found",
+            404,
+            errors={"message": "The requested user does not exist"}
+        )
@@ -0,0 +1,61 @@
+import os
+from decimal import Decimal
+import pytest
+from app import create_app, db
+from app.models.account import Account, AccountType
+from app.models.user import User
+
+TEST_SETTINGS = {
+    'SECRET_KEY': 'test-secret-key-with-at-least-32-bytes',
+    'JWT_SECRET_KEY': 'test-secret-key-with-at-least-32-bytes',
+    'BCRYPT_LOG_ROUNDS': 4,
+    'PASSWORD_HASH_WORKERS': 0,
+    'DB_BOOTSTRAP': False,
+}
+
+
+def _make_app(database_url, **settings):
+    app = create_app({
+        **TEST_SETTINGS,
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'SQLALCHEMY_BINDS': {},
+        **settings,
+    })
+    with app.app_context():
+        # Only the primary: other tests may have registered replica binds on db
+        db.drop_all(bind_key=None)
+        db.create_all(bind_key=None)
+    return app
+
+
+@pytest.fixture
+def app(tmp_path):
+    """App on a throwaway sqlite database."""
+    yield _make_app(f"sqlite:///{tmp_path / 'test.db'}")
+
+
+@pytest.fixture
+def pg_app():
+    """App on the PostgreSQL database in TEST_POSTGRESQL_URL (wiped)."""
+    url = os.getenv('TEST_POSTGRESQL_URL')
+    if not url:
+        pytest.skip("TEST_POSTGRESQL_URL is not set")
+    app = _make_app(url, DB_POOL_SIZE=20, DB_MAX_OVERFLOW=0)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def create_accounts(balances, username='owner'):
+    """A user owning one checking account per balance; returns their ids."""
+    user = User(username=username, email=f"{username}@example.com",
+                password_hash='not-a-real-hash')
+    accounts = [
+        Account(user=user, account_type=AccountType.CHECKING,
+                account_number=f"{index:012d}", balance=Decimal(balance))
+        for index, balance in enumerate(balances, start=1)
+    ]
+    db.session.add_all(accounts)
+    db.session.commit()
+    return [account.id for account in accounts]
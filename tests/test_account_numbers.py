@@ -0,0 +1,47 @@
+from app import db
+from app.models.account import Account, AccountType
+from app.models.user import User
+from app.services.account_numbers import (
+    FIRST_VALUE,
+    AccountNumberAllocator,
+    luhn_check_digit,
+)
+
+
+def _number(value: int) -> str:
+    return str(value) + luhn_check_digit(str(value))
+
+
+def test_luhn_check_digit():
+    assert luhn_check_digit('7992739871') == '3'
+    assert _number(FIRST_VALUE) == '100000000008'
+
+
+def test_numbers_are_sequential_across_blocks(app):
+    allocator = AccountNumberAllocator()
+    with app.app_context():
+        numbers = [allocator.allocate(block_size=2) for _ in range(5)]
+
+    assert numbers == [_number(FIRST_VALUE + offset) for offset in range(5)]
+
+
+def test_numbers_taken_by_legacy_accounts_are_skipped(app):
+    allocator = AccountNumberAllocator()
+    with app.app_context():
+        # Random numbers issued before the counter existed
+        user = User(username='legacy', email='legacy@example.com',
+                    password_hash='not-a-real-hash')
+        db.session.add_all([
+            Account(user=user, account_type=AccountType.CHECKING,
+                    account_number=_number(FIRST_VALUE + offset))
+            for offset in (0, 1, 3, 4)
+        ])
+        db.session.commit()
+
+        numbers = [allocator.allocate(block_size=2) for _ in range(2)]
+        # A whole block may be taken; the allocator reserves the next one
+        assert numbers == [_number(FIRST_VALUE + 2), _number(FIRST_VALUE + 5)]
+
+        db.session.add(Account(user=user, account_type=AccountType.SAVINGS,
+                               account_number=numbers[1]))
+        db.session.commit()
@@ -0,0 +1,42 @@
+import importlib
+import app.config
+from app import create_app
+
+ENVIRONMENT = {
+    'ACCOUNT_NUMBER_BLOCK_SIZE': '7',
+    'READ_YOUR_WRITES_SECONDS': '9',
+    'PASSWORD_HASH_WORKERS': '0',
+    'LOGIN_USER_LIMIT': '3',
+    'LOGIN_THROTTLE_CACHE_SIZE': '11',
+    'USER_CACHE_TTL': '13',
+    'TOKEN_REVOCATION_SYNC_INTERVAL': '17',
+    'DB_POOL_SIZE': '19',
+}
+
+
+def test_environment_settings_reach_app_config(monkeypatch, tmp_path):
+    monkeypatch.setenv('POSTGRESQL_URL', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv('SECRET_KEY', 'test-secret-key-with-at-least-32-bytes')
+    monkeypatch.setenv('DB_BOOTSTRAP', '0')
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    monkeypatch.setenv('POSTGRESQL_REPLICA_URLS', replica_url)
+    for name, value in ENVIRONMENT.items():
+        monkeypatch.setenv(name, value)
+    # Config reads the environment when its module is imported
+    importlib.reload(app.config)
+    try:
+        config = create_app().config
+    finally:
+        monkeypatch.undo()
+        importlib.reload(app.config)
+
+    assert config['SQLALCHEMY_BINDS'] == {'replica0': replica_url}
+    assert config['ACCOUNT_NUMBER_BLOCK_SIZE'] == 7
+    assert config['READ_YOUR_WRITES_SECONDS'] == 9
+    assert config['PASSWORD_HASH_WORKERS'] == 0
+    assert config['LOGIN_USER_LIMIT'] == 3
+    assert config['LOGIN_THROTTLE_CACHE_SIZE'] == 11
+    assert config['USER_CACHE_TTL'] == 13
+    assert config['TOKEN_REVOCATION_SYNC_INTERVAL'] == 17
+    assert config['DB_POOL_SIZE'] == 19
+    assert config['SQLALCHEMY_ENGINE_OPTIONS']['pool_size'] == 19
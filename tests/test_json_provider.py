@@ -0,0 +1,74 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.models.account import Account, AccountType
+from app.models.transaction import Transaction, TransactionType
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+
+PAYLOADS = [
+    {"amount": Decimal('10.50'), "zero": Decimal('0.00'), "big": Decimal('12345678.90')},
+    {"type": TransactionType.TRANSFER, "types": [TransactionType.DEPOSIT]},
+    {"text": "café \x01 \x7f \"quoted\" / \\", "none": None, "flag": True},
+    {"floats": [0.1, 2.5, 30.0, 1e16, 1e-7], "huge": 2 ** 70},
+    {"data": [{"b": 1, "a": {"d": [], "c": {}}}], "message": "ok"},
+]
+
+DATES = [
+    datetime(2025, 5, 1, 12, 30, 15, 123456),
+    datetime(2025, 5, 1, 12, 30, tzinfo=timezone.utc),
+    datetime(2025, 5, 1, 12, 30, 0, 5, tzinfo=timezone(timedelta(hours=7))),
+    date(2025, 5, 1),
+]
+
+
+class Model:
+    def __json__(self):
+        return {"amount": "1.00", "id": 1}
+
+
+@pytest.fixture(params=['stdlib', 'orjson'])
+def providers(request, monkeypatch):
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    app = Flask(__name__)
+    with app.app_context():
+        yield DefaultJSONProvider(app), FastJSONProvider(app)
+
+
+@pytest.mark.parametrize('payload', PAYLOADS)
+def test_response_bytes_match_flask(providers, payload):
+    flask_provider, fast_provider = providers
+    assert fast_provider.response(payload).get_data() == \
+        flask_provider.response(payload).get_data()
+
+
+def test_objects_with_json_hook(providers):
+    flask_provider, fast_provider = providers
+    assert fast_provider.response({"data": [Model()]}).get_data() == \
+        flask_provider.response({"data": [Model().__json__()]}).get_data()
+
+
+@pytest.mark.parametrize('value', DATES)
+def test_dates_in_iso_format(providers, value):
+    _, fast_provider = providers
+    assert fast_provider.response({"at": value}).get_data() == \
+        b'{"at":"%s"}\n' % value.isoformat().encode()
+
+
+@pytest.mark.parametrize('created_at', DATES[:3])
+def test_models_match_to_dict(providers, created_at):
+    flask_provider, fast_provider = providers
+    account = Account(id=1, user_id=2, account_type=AccountType.SAVINGS,
+                      account_number='100000000008', balance=Decimal('1234.50'),
+                      balance_slots=0, created_at=created_at, updated_at=created_at)
+    transaction = Transaction(id=3, from_account_id=None, to_account_id=1,
+                              amount=Decimal('0.10'), type=TransactionType.DEPOSIT,
+                              description=None, created_at=created_at)
+    models = [account, transaction]
+    assert fast_provider.response({"data": models}).get_data() == \
+        flask_provider.response({"data": [model.to_dict() for model in models]}).get_data()
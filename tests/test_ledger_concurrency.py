@@ -0,0 +1,76 @@
+"""Balance conservation under concurrent opposite-direction transfers.
+
+Needs PostgreSQL (TEST_POSTGRESQL_URL): sqlite serializes writers, so it
+cannot show lost updates or deadlocks.
+"""
+import threading
+from decimal import Decimal
+import pytest
+from sqlalchemy import func, select
+from app import db
+from app.models.account import Account
+from app.models.transaction import Transaction, TransactionType
+from app.services import hot_accounts, ledger
+from conftest import create_accounts
+
+THREADS = 16
+TRANSFERS_PER_THREAD = 50
+AMOUNT = Decimal('1.00')
+
+
+def _transfer(from_account_id: int, to_account_id: int) -> bool:
+    from_account, to_account, error = ledger.transfer(
+        from_account_id, to_account_id, AMOUNT)
+    if error:
+        db.session.rollback()
+        return False
+    ledger.record_transactions([{
+        "from_account_id": from_account.id,
+        "to_account_id": to_account.id,
+        "amount": AMOUNT,
+        "type": TransactionType.TRANSFER,
+        "description": "stress"
+    }])
+    db.session.commit()
+    return True
+
+
+@pytest.mark.parametrize('hot_slots', [0, 4])
+def test_opposite_transfers_conserve_balance(pg_app, hot_slots):
+    with pg_app.app_context():
+        first, second = create_accounts(['100.00', '100.00'])
+        if hot_slots:
+            hot_accounts.enable(second, hot_slots)
+
+    barrier = threading.Barrier(THREADS)
+    errors = []
+    completed = []
+
+    def work(index):
+        # Half the threads move money one way, half the other way
+        source, target = (first, second) if index % 2 else (second, first)
+        with pg_app.app_context():
+            barrier.wait()
+            done = 0
+            for _ in range(TRANSFERS_PER_THREAD):
+                try:
+                    done += _transfer(source, target)
+                except Exception as error:  # deadlocks, serialization failures
+                    db.session.rollback()
+                    errors.append(error)
+            completed.append(done)
+            db.session.remove()
+
+    threads = [threading.Thread(target=work, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with pg_app.app_context():
+        accounts = db.session.scalars(
+            select(Account).where(Account.id.in_([first, second]))).all()
+        assert sum(account.total_balance() for account in accounts) == Decimal('200.00')
+        assert all(account.total_balance() >= 0 for account in accounts)
+        assert db.session.scalar(select(func.count(Transaction.id))) == sum(completed)
@@ -0,0 +1,70 @@
+"""Converting transactions to a partitioned table without a long lock.
+
+Needs PostgreSQL (TEST_POSTGRESQL_URL).
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import event, func, insert, select, text
+from app import db
+from app.models.transaction import Transaction, TransactionType
+from app.services import partitions
+from conftest import create_accounts
+
+
+def _indexes(table):
+    return set(db.session.scalars(text(
+        "SELECT indexrelid::regclass::text FROM pg_index "
+        "WHERE indrelid = CAST(:table AS regclass)"), {"table": table}))
+
+
+def test_attach_reuses_indexes_and_skips_scan(pg_app):
+    with pg_app.app_context():
+        account_id, = create_accounts(['0.00'])
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        db.session.execute(insert(Transaction), [
+            {"from_account_id": None, "to_account_id": account_id,
+             "amount": Decimal('1.00'), "type": TransactionType.DEPOSIT,
+             "created_at": start + timedelta(hours=index)}
+            for index in range(500)
+        ])
+        db.session.commit()
+
+        # Legacy-table scans in the transaction running ATTACH, read right
+        # after it on the same connection
+        attach_scans = []
+
+        def after_execute(conn, cursor, statement, parameters, context, executemany):
+            if 'ATTACH PARTITION transactions_legacy' in statement:
+                probe = conn.connection.cursor()
+                probe.execute("SELECT pg_stat_get_xact_numscans("
+                              "'transactions_legacy'::regclass)")
+                attach_scans.append(probe.fetchone()[0])
+                probe.close()
+
+        event.listen(db.engine, 'after_cursor_execute', after_execute)
+        try:
+            boundary = partitions.convert_to_partitioned(months_ahead=1)
+        finally:
+            event.remove(db.engine, 'after_cursor_execute', after_execute)
+
+        assert attach_scans == [0]
+        # Only the indexes built before the lock; ATTACH built none of its own
+        assert _indexes('transactions_legacy') == {
+            'transactions_legacy_pkey',
+            'transactions_legacy_id_created_at_key',
+            'ix_transactions_legacy_from_account_id_created_at',
+            'ix_transactions_legacy_to_account_id_created_at',
+        }
+        assert db.session.scalar(text(
+            "SELECT count(*) FROM pg_inherits "
+            "WHERE inhrelid = ANY(ARRAY["
+            "'transactions_legacy_id_created_at_key'::regclass, "
+            "'ix_transactions_legacy_from_account_id_created_at'::regclass, "
+            "'ix_transactions_legacy_to_account_id_created_at'::regclass])")) == 3
+
+        assert partitions.is_partitioned()
+        assert ('transactions_legacy', None, boundary) in partitions.list_partitions()
+        assert db.session.scalar(select(func.count(Transaction.id))) == 500
+        db.session.add(Transaction(to_account_id=account_id, amount=Decimal('1.00'),
+                                   type=TransactionType.DEPOSIT))
+        db.session.commit()
@@ -0,0 +1,73 @@
+"""The default transaction listing reads about one page per index branch.
+
+Needs PostgreSQL (TEST_POSTGRESQL_URL) for EXPLAIN.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import insert, text
+from sqlalchemy.dialects import postgresql
+from app import db
+from app.models.transaction import Transaction, TransactionType
+from app.routes.transactions import filtered_transaction_branches, transactions_page_query
+from app.schemas import TransactionFilterSchema
+from conftest import create_accounts
+
+ROWS_PER_ACCOUNT = 3000
+SCANS = {'Seq Scan', 'Index Scan', 'Index Only Scan', 'Bitmap Heap Scan'}
+
+
+def _unbounded_sorts(node, sort=None):
+    """Sort nodes that read a table scan directly, with no Limit in between."""
+    found = []
+    if node['Node Type'] == 'Limit':
+        sort = None
+    elif node['Node Type'] == 'Sort':
+        sort = node
+    elif node['Node Type'] in SCANS and sort is not None:
+        found.append(sort)
+    for child in node.get('Plans', []):
+        found.extend(_unbounded_sorts(child, sort))
+    return found
+
+
+def _scans(node):
+    if node['Node Type'] in SCANS and node.get('Relation Name') == 'transactions':
+        yield node
+    for child in node.get('Plans', []):
+        yield from _scans(child)
+
+
+def test_listing_without_account_filter_has_no_full_sort(pg_app):
+    with pg_app.app_context():
+        account_ids = create_accounts(['0.00', '0.00', '0.00'])
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        db.session.execute(insert(Transaction), [
+            {"from_account_id": None, "to_account_id": account_id,
+             "amount": Decimal('1.00'), "type": TransactionType.DEPOSIT,
+             "created_at": start + timedelta(minutes=index * 3 + offset)}
+            for offset, account_id in enumerate(account_ids)
+            for index in range(ROWS_PER_ACCOUNT)
+        ])
+        db.session.commit()
+        db.session.execute(text("ANALYZE transactions"))
+        db.session.commit()
+        user_id = db.session.scalar(text(
+            "SELECT user_id FROM accounts WHERE id = :id"), {"id": account_ids[0]})
+
+    with pg_app.test_request_context():
+        branches, error = filtered_transaction_branches(
+            user_id, TransactionFilterSchema.validate({}))
+        assert error is None
+        stmt = transactions_page_query(branches, 21).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        plan = db.session.scalar(text(f"EXPLAIN (FORMAT JSON) {stmt}"))
+        plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]['Plan']
+        rows = db.session.execute(
+            transactions_page_query(branches, 21)).all()
+
+    assert len(rows) == 21
+    assert _unbounded_sorts(plan) == []
+    scans = list(_scans(plan))
+    assert len(scans) == 2 * len(account_ids)
+    assert all(scan['Node Type'] in ('Index Scan', 'Index Only Scan') for scan in scans)
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from app import db
+from app.models.account import Account, AccountType
+from app.models.user import User
+from app.models.transfer_intent import TransferIntent, TransferIntentStatus
+from app.services import ledger, transfer_worker
+from conftest import create_accounts
+
+
+def _submit(user_id, from_account_id, to_account_id, amount):
+    intent = TransferIntent(user_id=user_id, from_account_id=from_account_id,
+                            to_account_id=to_account_id, amount=Decimal(amount))
+    db.session.add(intent)
+    db.session.commit()
+    return intent.id
+
+
+def _result(intent_id):
+    intent = db.session.get(TransferIntent, intent_id)
+    return intent.status, intent.error
+
+
+def test_missing_source_account_is_not_reported_as_insufficient_funds(app):
+    with app.app_context():
+        closed, target = create_accounts(['50.00', '0.00'])
+        stranger = Account(account_type=AccountType.CHECKING, account_number='999999999999',
+                           balance=Decimal('50.00'),
+                           user=User(username='other', email='other@example.com',
+                                     password_hash='not-a-real-hash'))
+        db.session.add(stranger)
+        db.session.commit()
+        other = stranger.id
+        user_id = db.session.get(Account, closed).user_id
+        db.session.get(Account, closed).deleted_at = datetime.now(timezone.utc)
+        db.session.commit()
+
+        intents = [
+            _submit(user_id, closed, target, '10.00'),
+            _submit(user_id, other, target, '10.00'),
+            _submit(user_id, target, closed, '10.00'),
+            _submit(user_id, target, other, '10.00'),
+        ]
+        assert transfer_worker.process_batch() == 4
+
+        not_found = (TransferIntentStatus.FAILED, transfer_worker.SOURCE_NOT_FOUND)
+        assert _result(intents[0]) == not_found
+        assert _result(intents[1]) == not_found
+        assert _result(intents[2]) == (
+            TransferIntentStatus.FAILED,
+            transfer_worker.INTENT_ERRORS[ledger.ACCOUNT_NOT_FOUND])
+        assert _result(intents[3]) == (
+            TransferIntentStatus.FAILED,
+            transfer_worker.INTENT_ERRORS[ledger.INSUFFICIENT_FUNDS])
+        assert db.session.get(Account, other).balance == Decimal('50.00')